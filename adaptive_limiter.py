@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Adaptive AIMD request limiter shared by the async fetch engine and the sync scrapers
+Requests are paced at `rate` per second with at most `concurrency` in flight.
+Every `window` healthy responses raise the rate by `increase` req/s and the
+concurrency by one (additive increase). A 429/503, a 5xx, a transport error
+or a latency average above target cuts both by `decrease` (multiplicative
+decrease), at most once per window of requests. Retry-After is honoured by
+holding all requests until it expires.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+DEFAULT_MIN_RATE = 0.1
+DEFAULT_MAX_RATE = 20.0
+DEFAULT_MAX_CONCURRENCY = 32
+THROTTLE_STATUSES = {429, 503}
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+class AdaptiveLimiter:
+    """
+    AIMD pacing for one host. Call wait() (sync) or await acquire() (async)
+    before each request and record() with the outcome afterwards. `rate` and
+    `concurrency` are the current limits.
+    """
+
+    def __init__(self, rate=1.0, concurrency=1, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, increase=0.5, decrease=0.5,
+                 window=10, latency_target=None):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, min_rate), self.max_rate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = min(max(1, concurrency), self.max_concurrency)
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        # None: slow means three times the best latency average seen so far
+        self.latency_target = latency_target
+        self.latency = None
+        self.best_latency = None
+        self.throttled = 0
+        self._healthy = 0
+        self._next_at = 0.0
+        self._blocked_until = 0.0
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay, **kwargs):
+        """Limiter starting at one request per `delay` seconds (0: start at max_rate)"""
+        max_rate = kwargs.get("max_rate", DEFAULT_MAX_RATE)
+        return cls(rate=1.0 / delay if delay > 0 else max_rate, **kwargs)
+
+    def reserve(self):
+        """Claim the next request slot; returns seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at, self._blocked_until)
+            self._next_at = start + 1.0 / self.rate
+            return start - now
+
+    def wait(self):
+        time.sleep(self.reserve())
+
+    async def acquire(self):
+        await asyncio.sleep(self.reserve())
+
+    def record(self, status=None, elapsed=None, retry_after=None):
+        """
+        Feed back one response: `status` None means no response (timeout,
+        connection error), `elapsed` is its latency in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                if status in THROTTLE_STATUSES:
+                    self.throttled += 1
+                wait = parse_retry_after(retry_after)
+                if wait is not None:
+                    self._blocked_until = max(self._blocked_until, now + wait)
+                self._slow_down(now)
+                return
+
+            if elapsed is not None:
+                self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+                self.best_latency = self.latency if self.best_latency is None else min(self.best_latency, self.latency)
+            target = self.latency_target or (3 * self.best_latency if self.best_latency else None)
+            if target is not None and self.latency > target:
+                self._slow_down(now)
+                return
+
+            self._healthy += 1
+            if self._healthy >= self.window:
+                self._healthy = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def _slow_down(self, now):
+        self._healthy = 0
+        # One cut per window of requests, not one per failure in a burst
+        if now < self._cooldown_until:
+            return
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        self._cooldown_until = now + max(self.window / self.rate, self.latency or 0.0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "concurrency": self.concurrency,
+                "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+                "throttled": self.throttled,
+                "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Vectorized statistics over the historical results
+The history is loaded once (from the columnar .col file, rebuilt from the CSV
+when missing or stale) and every table is computed for all games at once with
+NumPy: frequency histograms, per-year/per-month counts, gap/recency tables
+for all 100 values, and andar/bahar digit distributions.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from columnar_store import MISSING, columnar_path, csv_to_columnar, load_columnar
+
+DEFAULT_CSV = "comprehensive_historical_data.csv"
+VALUES = 100
+
+def load_history(csv_path=DEFAULT_CSV):
+    """Columnar view of `csv_path`, converting it first if the .col copy is missing or older"""
+    col_path = columnar_path(csv_path)
+    if not os.path.exists(col_path) or os.path.getmtime(col_path) < os.path.getmtime(csv_path):
+        csv_to_columnar(csv_path, col_path)
+    return load_columnar(col_path)
+
+class HistoryStats:
+    """
+    All games stacked into one (games x rows) uint8 matrix. Most tables are
+    built with a single bincount over `game * 100 + value` keys.
+    """
+
+    def __init__(self, history, games=None):
+        self.games = list(games or history.games)
+        self.day = np.asarray(history.day, dtype=np.int64)
+        self.values = np.vstack([history.games[g] for g in self.games]) if self.games else \
+            np.empty((0, len(self.day)), dtype=np.uint8)
+        self.present = self.values != MISSING
+        # Flattened (game, value) key per present result, plus its day
+        game_idx = np.broadcast_to(np.arange(len(self.games))[:, None], self.values.shape)
+        self._keys = (game_idx * VALUES + self.values)[self.present].astype(np.int64)
+        self._key_days = np.broadcast_to(self.day, self.values.shape)[self.present]
+
+    def _per_game(self, flat, width):
+        return flat.reshape(len(self.games), width)
+
+    def frequencies(self):
+        """(games x 100) count of each value"""
+        counts = np.bincount(self._keys, minlength=len(self.games) * VALUES)
+        return self._per_game(counts, VALUES)
+
+    def digit_distributions(self):
+        """(andar, bahar): (games x 10) counts of the tens and units digit"""
+        game = self._keys // VALUES
+        value = self._keys % VALUES
+        size = len(self.games) * 10
+        andar = np.bincount(game * 10 + value // 10, minlength=size)
+        bahar = np.bincount(game * 10 + value % 10, minlength=size)
+        return self._per_game(andar, 10), self._per_game(bahar, 10)
+
+    def monthly_counts(self):
+        """(months, games x months) results recorded per calendar month"""
+        if not len(self.day):
+            return np.array([], dtype="datetime64[M]"), np.zeros((len(self.games), 0), dtype=np.int64)
+        month = self.day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first = month.min()
+        width = int(month.max() - first) + 1
+        idx = np.arange(len(self.games))[:, None] * width + (month - first)
+        counts = np.bincount(idx[self.present], minlength=len(self.games) * width)
+        months = (np.arange(width) + first).astype("datetime64[M]")
+        return months, self._per_game(counts, width)
+
+    def yearly_counts(self):
+        """(years, games x years) results recorded per calendar year"""
+        months, counts = self.monthly_counts()
+        if not len(months):
+            return np.array([], dtype=np.int64), counts
+        years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+        first = years.min()
+        idx = years - first
+        width = int(idx.max()) + 1
+        totals = np.zeros((len(self.games), width), dtype=np.int64)
+        np.add.at(totals, (slice(None), idx), counts)
+        return np.arange(width) + first, totals
+
+    def recency(self, as_of=None):
+        """(games x 100) days since each value was last seen; -1 if never seen"""
+        last = np.full(len(self.games) * VALUES, -1, dtype=np.int64)
+        np.maximum.at(last, self._keys, self._key_days)
+        if as_of is None:
+            # An empty store has no last day; every value is then "never seen"
+            as_of = int(self.day.max()) if len(self.day) else 0
+        since = np.where(last >= 0, as_of - last, -1)
+        return self._per_game(since, VALUES)
+
+    def gaps(self):
+        """(max_gap, mean_gap): (games x 100) days between consecutive appearances"""
+        order = np.lexsort((self._key_days, self._keys))
+        keys = self._keys[order]
+        days = self._key_days[order]
+        same = keys[1:] == keys[:-1]
+        deltas = (days[1:] - days[:-1])[same]
+        gap_keys = keys[1:][same]
+        size = len(self.games) * VALUES
+        count = np.bincount(gap_keys, minlength=size)
+        total = np.bincount(gap_keys, weights=deltas, minlength=size)
+        max_gap = np.zeros(size, dtype=np.int64)
+        np.maximum.at(max_gap, gap_keys, deltas)
+        mean_gap = np.divide(total, count, out=np.zeros(size), where=count > 0)
+        return self._per_game(max_gap, VALUES), self._per_game(mean_gap, VALUES)
+
+    def summary(self):
+        """Every table as JSON-ready lists, keyed by game"""
+        freq = self.frequencies()
+        andar, bahar = self.digit_distributions()
+        since = self.recency()
+        max_gap, mean_gap = self.gaps()
+        months, monthly = self.monthly_counts()
+        years, yearly = self.yearly_counts()
+        return {
+            "months": [str(m) for m in months],
+            "years": years.tolist(),
+            "games": {
+                game: {
+                    "frequency": freq[i].tolist(),
+                    "andar": andar[i].tolist(),
+                    "bahar": bahar[i].tolist(),
+                    "days_since_seen": since[i].tolist(),
+                    "max_gap": max_gap[i].tolist(),
+                    "mean_gap": np.round(mean_gap[i], 2).tolist(),
+                    "monthly_counts": monthly[i].tolist(),
+                    "yearly_counts": yearly[i].tolist(),
+                }
+                for i, game in enumerate(self.games)
+            },
+        }
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV
+    out_path = sys.argv[2] if len(sys.argv) > 2 else "historical_stats.json"
+
+    started = time.perf_counter()
+    history = load_history(csv_path)
+    stats = HistoryStats(history)
+    summary = stats.summary()
+    elapsed = time.perf_counter() - started
+
+    with open(out_path, "w") as f:
+        json.dump(summary, f)
+
+    print(f"📊 {len(history)} rows, {len(stats.games)} games, {len(summary['months'])} months")
+    print(f"⚡ All tables computed in {elapsed * 1000:.1f} ms")
+    print(f"📄 Saved to: {out_path}")
+    for i, game in enumerate(stats.games):
+        hot = np.argsort(stats.frequencies()[i])[::-1][:3]
+        print(f"  {game}: most frequent {[f'{v:02d}' for v in hot]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chart-table parser backends on saved fixture pages
+Reports pages/s and rows/s per backend and the speedup over BeautifulSoup,
+parsing whole pages and parsing only the byte-sliced chart-table region.
+When the fixture directory is empty it is filled with synthetic chart pages
+rendered from comprehensive_historical_data.csv (padded with the kind of nav,
+ad and link blocks the live pages carry) so the benchmark runs offline.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import time
+
+from chart_parser import BACKENDS, chart_table_slice
+
+FIXTURE_DIR = os.path.join("fixtures", "chart")
+SOURCE_CSV = "comprehensive_historical_data.csv"
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+def render_chart_page(year, month, rows):
+    """Render a page shaped like satta-king-fast.com's monthly chart"""
+    name = MONTH_NAMES[month - 1]
+    nav = "".join(
+        f'<li><a href="/chart.php?ResultFor={MONTH_NAMES[m % 12]}-{y}&month={m % 12 + 1:02d}&year={y}">'
+        f'{MONTH_NAMES[m % 12]} {y} Chart</a></li>'
+        for y in range(2015, 2026) for m in range(12)
+    )
+    ad = '<div class="ad-banner"><a href="/go"><img src="/banner.gif" alt="ad"></a>' + "<p>Satta King Fast Result</p>" * 40 + "</div>"
+    today = "".join(
+        f'<tr><td class="game-name">GAME {i}</td><td>{i:02d}</td><td>{(i * 7) % 100:02d}</td></tr>' for i in range(40)
+    )
+    body = "".join(
+        f'<tr class="day-number"><td class="day-number">{int(r["day"]):02d}</td>'
+        f'<td>{r["dswr"] or "XX"}</td><td>{r["frbd"] or "XX"}</td>'
+        f'<td>{r["gzbd"] or "XX"}</td><td>{r["gali"] or "XX"}</td></tr>'
+        for r in rows
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Monthly Satta King Result Chart of {name} {year}</title>"
+        f'<meta charset="utf-8"></head><body><header><ul class="nav">{nav}</ul></header>'
+        f"{ad * 6}<table class=\"result-table\">{today}</table>"
+        f"<h1>Satta King Chart of {name} {year}</h1>"
+        f'<table class="chart-table"><tr><th>DATE</th><th>DSWR</th><th>FRBD</th><th>GZBD</th><th>GALI</th></tr>'
+        f"{body}</table>{ad * 6}<footer><ul>{nav}</ul></footer></body></html>"
+    )
+
+def write_synthetic_fixtures(directory, source=SOURCE_CSV, limit=24):
+    months = {}
+    with open(source, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["year"].isdigit() and row["month"].isdigit():
+                months.setdefault((int(row["year"]), int(row["month"])), []).append(row)
+    os.makedirs(directory, exist_ok=True)
+    for year, month in sorted(months)[:limit]:
+        path = os.path.join(directory, f"{year}-{month:02d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_chart_page(year, month, months[(year, month)]))
+    print(f"📝 Wrote {min(limit, len(months))} synthetic fixture pages to {directory}")
+
+def load_fixtures(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+def bench(backend, pages, repeat, sliced=False):
+    fn = BACKENDS[backend]
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            if sliced:
+                html = chart_table_slice(html) or html
+            rows += len(fn(html) or [])
+    elapsed = time.perf_counter() - started
+    return rows, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart-table parser backends")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="directory of saved chart pages")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the fixture set")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        write_synthetic_fixtures(args.fixtures)
+        pages = load_fixtures(args.fixtures)
+
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"📄 {len(pages)} fixture pages, {size_kb:.0f} KB average, {args.repeat} passes")
+
+    # Every fast backend must agree with the BeautifulSoup reference
+    reference = [BACKENDS["bs4"](html) for html in pages]
+    for name in BACKENDS:
+        if name != "bs4" and [BACKENDS[name](html) for html in pages] != reference:
+            print(f"⚠️  {name} output differs from bs4")
+
+    # Every sliced parse must agree with the whole-page one
+    raw_pages = [html.encode("utf-8") for html in pages]
+    if [BACKENDS["bs4"](chart_table_slice(raw) or raw) for raw in raw_pages] != reference:
+        print("⚠️  sliced output differs from whole-page output")
+    sliced_kb = sum(len(chart_table_slice(raw) or raw) for raw in raw_pages) / len(raw_pages) / 1024
+    print(f"✂️  Sliced chart-table region: {sliced_kb:.1f} KB average")
+
+    baseline = None
+    print(f"\n{'backend':<18}{'pages/s':>10}{'rows/s':>12}{'speedup':>10}")
+    for name in ["bs4"] + [n for n in BACKENDS if n != "bs4"]:
+        for sliced in (False, True):
+            rows, elapsed = bench(name, raw_pages if sliced else pages, args.repeat, sliced)
+            rows_per_s = rows / elapsed
+            baseline = baseline or rows_per_s
+            pages_per_s = len(pages) * args.repeat / elapsed
+            label = f"{name} (sliced)" if sliced else name
+            print(f"{label:<18}{pages_per_s:>10.1f}{rows_per_s:>12.0f}{rows_per_s / baseline:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper benchmark against a local mock of satta-king-fast.com
+Month pages are recorded from the live site once (--record) into a fixture
+directory; without a recording, synthetic chart pages are rendered from
+comprehensive_historical_data.csv instead. A local HTTP server then serves
+the fixtures with configurable latency and injected 5xx errors, and each
+scraper runs against it in a scratch directory. Reported per scraper:
+pages/s, rows/s, p50/p99 request latency (measured at the server, including
+the injected delay) and peak RSS of the scraper process.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from bench_chart_parser import MONTH_NAMES, write_synthetic_fixtures
+
+FIXTURE_DIR = os.path.join("fixtures", "site")
+LIVE_URL = "https://satta-king-fast.com/"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (script, output CSV, extra arguments given the mock base URL and options)
+SCRAPERS = {
+    "comprehensive": (
+        "comprehensive_scraper.py", "comprehensive_historical_data.csv",
+        lambda base, args: ["--base-url", base, "--rate", str(args.rate),
+                            "--concurrency", str(args.concurrency)],
+    ),
+    "historical": (
+        "historical_scraper.py", "historical_satta_data.csv",
+        lambda base, args: ["--base-url", base, "--delay", "0"],
+    ),
+    "satta": (
+        "satta_scraper.py", "satta_2015_2024.csv",
+        lambda base, args: ["--base-url", base, "--delay", "0"],
+    ),
+}
+
+def fixture_name(year, month):
+    return f"{year}-{month:02d}.html"
+
+def record_fixtures(directory, base_url=LIVE_URL, years=range(2015, 2025), delay=1.0):
+    """Save the live homepage and every month page once"""
+    from comprehensive_scraper import HEADERS, generate_urls
+
+    os.makedirs(directory, exist_ok=True)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    targets = [(base_url, "index.html")]
+    targets += [(url, fixture_name(year, month)) for url, year, month in generate_urls(base_url, years)]
+    saved = 0
+    for url, name in targets:
+        try:
+            resp = session.get(url, timeout=20)
+            resp.raise_for_status()
+        except Exception as e:
+            print(f"❌ {url}: {e}")
+            continue
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(resp.content)
+        saved += 1
+        time.sleep(delay)
+    print(f"📼 Recorded {saved}/{len(targets)} pages into {directory}")
+
+def write_synthetic_site(directory):
+    """Synthetic month pages plus a homepage linking to every month"""
+    write_synthetic_fixtures(directory, limit=len(range(2015, 2025)) * 12)
+    links = "".join(
+        f'<li><a href="/chart.php?ResultFor={MONTH_NAMES[m - 1]}-{y}&month={m:02d}&year={y}">'
+        f"{MONTH_NAMES[m - 1]} {y}</a></li>"
+        for y in range(2015, 2025) for m in range(1, 13)
+    )
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<html><head><title>Satta King Fast</title></head><body><ul>{links}</ul></body></html>")
+
+def load_site(directory):
+    pages = {}
+    for path in glob.glob(os.path.join(directory, "*.html")):
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+class MockSite(ThreadingHTTPServer):
+    """
+    Serves fixture pages by their month/year query. Absolute links to the live
+    site are rewritten to this server so the crawlers stay on it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pages, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}/"
+        live = LIVE_URL.encode()
+        self.pages = {name: body.replace(live, self.base_url.encode()) for name, body in pages.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.latencies = []
+            self.statuses = {}
+
+    def record(self, status, elapsed):
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def draw(self):
+        """(delay, inject_error) for one request"""
+        with self.lock:
+            delay = max(0.0, self.random.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+            return delay, self.random.random() < self.error_rate
+
+    def lookup(self, path):
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if "year" in query and "month" in query:
+            try:
+                return self.pages.get(fixture_name(int(query["year"][0]), int(query["month"][0])))
+            except ValueError:
+                return None
+        if url.path in ("/", "/index.html", "/index.php"):
+            return self.pages.get("index.html")
+        return None
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        started = time.perf_counter()
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+        body = None if fail else self.server.lookup(self.path)
+        if fail:
+            status, body = 503, b"injected error"
+        elif body is None:
+            status, body = 404, b"not found"
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(status, time.perf_counter() - started)
+
+    def log_message(self, *args):
+        pass
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def count_rows(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        return max(0, sum(1 for _ in f) - 1)
+
+def run_scraper(name, site, args):
+    """Run one scraper in a scratch directory; returns its result dict"""
+    script, outfile, extra = SCRAPERS[name]
+    workdir = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    cmd = [sys.executable, os.path.join(HERE, script)] + extra(site.base_url, args)
+    site.reset_stats()
+    try:
+        with open(os.path.join(workdir, "scraper.log"), "w") as log:
+            started = time.perf_counter()
+            proc = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+            # wait4 gives this child's own rusage, so peak RSS is not mixed across runs
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            elapsed = time.perf_counter() - started
+        rows = count_rows(os.path.join(workdir, outfile))
+    finally:
+        if args.keep:
+            print(f"📁 {name} output kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with site.lock:
+        latencies = list(site.latencies)
+        statuses = dict(site.statuses)
+    pages = statuses.get(200, 0)
+    return {
+        "scraper": name,
+        "exit_code": proc.returncode,
+        "seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "pages": pages,
+        "statuses": statuses,
+        "rows": rows,
+        "pages_per_s": round(pages / elapsed, 2),
+        "rows_per_s": round(rows / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+    }
+
+def print_report(results):
+    print(f"\n{'scraper':<15}{'pages':>7}{'pages/s':>10}{'rows':>8}{'rows/s':>10}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'RSS MB':>9}  status")
+    for r in results:
+        codes = ", ".join(f"{code}x{n}" for code, n in sorted(r["statuses"].items()))
+        print(f"{r['scraper']:<15}{r['pages']:>7}{r['pages_per_s']:>10.1f}{r['rows']:>8}{r['rows_per_s']:>10.0f}"
+              f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['peak_rss_mb']:>9.1f}  {codes}")
+        if r["exit_code"]:
+            print(f"  ⚠️  {r['scraper']} exited with code {r['exit_code']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against a local mock site")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="directory of recorded pages")
+    parser.add_argument("--record", action="store_true",
+                        help="record the live homepage and month pages into --fixtures, then exit")
+    parser.add_argument("--scrapers", nargs="+", default=list(SCRAPERS), choices=list(SCRAPERS))
+    parser.add_argument("--latency", type=float, default=50.0, help="mean response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="standard deviation of the delay in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency and error injection")
+    parser.add_argument("--concurrency", type=int, default=8, help="comprehensive_scraper concurrency")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="comprehensive_scraper per-host rate limit (req/s)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep each scraper's scratch directory")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.record:
+        record_fixtures(args.fixtures)
+        return
+
+    if not glob.glob(os.path.join(args.fixtures, "*.html")):
+        write_synthetic_site(args.fixtures)
+    pages = load_site(args.fixtures)
+
+    site = MockSite(pages, args.latency / 1000, args.jitter / 1000, args.error_rate, args.seed)
+    threading.Thread(target=site.serve_forever, daemon=True).start()
+    print(f"🌐 Mock site at {site.base_url} serving {len(pages)} pages "
+          f"(latency {args.latency:.0f}±{args.jitter:.0f} ms, error rate {args.error_rate:.0%})")
+
+    results = []
+    try:
+        for name in args.scrapers:
+            print(f"⏱️  Running {name}...")
+            results.append(run_scraper(name, site, args))
+    finally:
+        site.shutdown()
+        site.server_close()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Pluggable parser backends for the satta-king-fast.com chart table
+Every backend returns the cell texts of each <tr class="day-number"> inside
+<table class="chart-table">, or None when the page has no chart table.
+selectolax and lxml are C-backed fast paths; BeautifulSoup is the fallback
+used whenever a fast backend is missing or fails on a page.
+Raw page bytes are first cut down to the chart table (plus the title and
+headings month inference reads) with byte searches over a memoryview, so
+the ads, banners and link blocks around it are never decoded or parsed.
+"""
+
+import re
+from html import unescape
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        # selectolax < 1.0 only ships the Modest backend
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+CHART_TABLE_XPATH = "//table[contains(concat(' ', normalize-space(@class), ' '), ' chart-table ')]"
+DAY_ROW_XPATH = ".//tr[contains(concat(' ', normalize-space(@class), ' '), ' day-number ')]"
+
+def rows_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", class_="chart-table")
+    if not table:
+        return None
+    return [
+        [cell.get_text(strip=True) for cell in row.find_all(["td", "th"])]
+        for row in table.find_all("tr", class_="day-number")
+    ]
+
+def rows_selectolax(html):
+    table = HTMLParser(html).css_first("table.chart-table")
+    if table is None:
+        return None
+    return [
+        [cell.text(strip=True) for cell in row.css("td, th")]
+        for row in table.css("tr.day-number")
+    ]
+
+def rows_lxml(html):
+    tables = lxml.html.fromstring(html).xpath(CHART_TABLE_XPATH)
+    if not tables:
+        return None
+    return [
+        ["".join(s.strip() for s in cell.itertext()) for cell in row.xpath(".//td | .//th")]
+        for row in tables[0].xpath(DAY_ROW_XPATH)
+    ]
+
+def _element_span(body, start, tag):
+    """(start, end) of the element opening at `start`, through its closing tag"""
+    end = body.find(b"</" + tag + b">", start)
+    return None if end < 0 else (start, end + len(tag) + 3)
+
+def chart_table_slice(body):
+    """
+    The <title>, the first <h1>..<h4> and the chart table cut out of the raw
+    page bytes as a small standalone document, or None when the markers are
+    not where they are expected (the caller then parses the whole page)
+    """
+    if not isinstance(body, (bytes, bytearray)):
+        return None
+    marker = body.find(b"chart-table")
+    if marker < 0:
+        return None
+    start = body.rfind(b"<table", 0, marker)
+    # The marker has to sit inside that <table ...> tag, not after it
+    if start < 0 or body.find(b">", start) < marker:
+        return None
+    end = body.find(b"</table>", marker)
+    if end < 0 or body.find(b"<table", start + 6, end) >= 0:
+        return None
+    end += len(b"</table>")
+
+    view = memoryview(body)
+    head = []
+    title = body.find(b"<title")
+    span = _element_span(body, title, b"title") if title >= 0 else None
+    if span:
+        head.append(view[span[0]:span[1]])
+    headings = []
+    for tag in (b"h1", b"h2", b"h3", b"h4"):
+        pos = body.find(b"<" + tag)
+        span = _element_span(body, pos, tag) if pos >= 0 else None
+        if span and not (start <= span[0] < end):
+            headings.append(span)
+    parts = [b"<html><head>", *head, b"</head><body>"]
+    parts += [view[a:b] for a, b in sorted(headings)]
+    parts += [view[start:end], b"</body></html>"]
+    return b"".join(parts)
+
+HREF_RE = re.compile(rb"""<a\s[^>]*?href\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+
+def page_links(body, encoding=None):
+    """Every <a href> of a raw page, unescaped, without building a tree"""
+    encoding = encoding or "utf-8"
+    return [unescape(m.group(1).decode(encoding, errors="replace")) for m in HREF_RE.finditer(body)]
+
+BACKENDS = {"bs4": rows_bs4}
+if lxml is not None:
+    BACKENDS["lxml"] = rows_lxml
+if HTMLParser is not None:
+    BACKENDS["selectolax"] = rows_selectolax
+
+# Fastest available first
+AUTO_ORDER = [name for name in ("selectolax", "lxml") if name in BACKENDS]
+
+def _parse_rows(html, backend):
+    names = AUTO_ORDER if backend == "auto" else [backend]
+    for name in names:
+        if name == "bs4":
+            break
+        try:
+            rows = BACKENDS[name](html)
+        except Exception:
+            continue
+        if rows is not None:
+            return rows
+    return rows_bs4(html)
+
+def parse_chart_rows(html, backend="auto"):
+    """
+    Cell texts of every day row in the chart table, or None if there is none.
+    Raw bytes are sliced down to the chart table first; if the slice cannot
+    be cut or yields no table, the whole page is parsed. A fast backend that
+    raises or finds no table hands over to BeautifulSoup, so a fast path can
+    never lose rows the old parser would have found.
+    """
+    sliced = chart_table_slice(html)
+    if sliced is not None:
+        rows = _parse_rows(sliced, backend)
+        if rows is not None:
+            return rows
+    return _parse_rows(html, backend)
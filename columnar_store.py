@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Compact columnar store for the historical results
+Layout (little-endian):
+  8 bytes   magic b"SATCOL01"
+  uint32    length of the JSON header
+  JSON      {"rows", "games", "urls", "columns": {name: [offset, dtype]}}
+  arrays    8-byte aligned: day (int32 days since 1970-01-01), one uint8
+            column per game (MISSING = no result), url (uint16 index into
+            the "urls" dictionary)
+Loading maps the file and wraps each column with numpy.frombuffer, so no row
+is ever parsed.
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"SATCOL01"
+MISSING = 255
+GAMES = ("dswr", "frbd", "gzbd", "gali", "Gali1")
+EPOCH = date(1970, 1, 1).toordinal()
+
+def columnar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".col"
+
+def day_number(date_str):
+    """Days since 1970-01-01 for a YYYY-MM-DD string, or None if it is not a real date"""
+    try:
+        return date.fromisoformat(date_str).toordinal() - EPOCH
+    except (TypeError, ValueError):
+        return None
+
+def encode_value(value):
+    value = (value or "").strip()
+    if value.isdigit() and len(value) <= 2:
+        return int(value)
+    return MISSING
+
+def write_columnar(rows, path, games=GAMES):
+    """
+    Write row dicts (date, source_url and game keys) as a columnar file.
+    Rows without a real date are skipped; rows are stored in date order.
+    Returns the number of rows written.
+    """
+    days = array("i")
+    values = {game: array("B") for game in games}
+    url_ids = array("H")
+    urls = {}
+    for row in rows:
+        day = day_number(row.get("date"))
+        if day is None:
+            continue
+        days.append(day)
+        for game in games:
+            values[game].append(encode_value(row.get(game)))
+        url_ids.append(urls.setdefault(row.get("source_url") or "", len(urls)))
+
+    if any(days[i] > days[i + 1] for i in range(len(days) - 1)):
+        order = sorted(range(len(days)), key=days.__getitem__)
+        days = array("i", (days[i] for i in order))
+        values = {g: array("B", (col[i] for i in order)) for g, col in values.items()}
+        url_ids = array("H", (url_ids[i] for i in order))
+
+    columns = [("day", days, "<i4")] + [(g, values[g], "u1") for g in games] + [("url", url_ids, "<u2")]
+    header = {"rows": len(days), "games": list(games), "urls": list(urls), "columns": {}}
+
+    # Offsets depend on the header length and vice versa; iterate until stable
+    while True:
+        blob = json.dumps(header).encode("utf-8")
+        offset = len(MAGIC) + 4 + len(blob)
+        layout = {}
+        for name, data, dtype in columns:
+            offset += -offset % 8
+            layout[name] = [offset, dtype]
+            offset += len(data) * data.itemsize
+        if layout == header["columns"]:
+            break
+        header["columns"] = layout
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(blob)) + blob)
+        for name, data, _ in columns:
+            f.write(b"\0" * (header["columns"][name][0] - f.tell()))
+            if sys.byteorder == "big" and data.itemsize > 1:
+                data = array(data.typecode, data)
+                data.byteswap()
+            f.write(data.tobytes())
+    os.replace(tmp, path)
+    return len(days)
+
+def csv_to_columnar(csv_path, path=None, games=GAMES):
+    """Convert a historical CSV; games missing from its header are stored as all-MISSING"""
+    path = path or columnar_path(csv_path)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        count = write_columnar(csv.DictReader(f), path, games)
+    return path, count
+
+class ColumnarHistory:
+    """
+    Memory-mapped view of a columnar file. `day` is an int32 array of days
+    since 1970-01-01, `games[name]` a uint8 array (MISSING where there is no
+    result), `url` a uint16 index into `urls`.
+    """
+
+    def __init__(self, path):
+        if np is None:
+            raise ImportError("numpy is required to load columnar files")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a columnar history file")
+        (length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mm[start:start + length])
+        self.rows = header["rows"]
+        self.urls = header["urls"]
+
+        def column(name):
+            offset, dtype = header["columns"][name]
+            return np.frombuffer(self._mm, dtype=dtype, count=self.rows, offset=offset)
+
+        self.day = column("day")
+        self.games = {game: column(game) for game in header["games"]}
+        self.url = column("url")
+
+    def __len__(self):
+        return self.rows
+
+    def dates(self):
+        return self.day.astype("datetime64[D]")
+
+    def close(self):
+        # Drop the array views first; mmap refuses to close while exported
+        self.day = self.url = None
+        self.games = {}
+        self._mm.close()
+
+def load_columnar(path):
+    return ColumnarHistory(path)
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "comprehensive_historical_data.csv"
+    path, count = csv_to_columnar(csv_path)
+    csv_size = os.path.getsize(csv_path)
+    col_size = os.path.getsize(path)
+    print(f"✅ {count} rows -> {path}")
+    print(f"📦 {col_size:,} bytes vs {csv_size:,} bytes CSV ({col_size / csv_size:.1%})")
+
+    started = time.perf_counter()
+    history = load_columnar(path)
+    elapsed = time.perf_counter() - started
+    print(f"⚡ Loaded {len(history)} rows in {elapsed * 1e6:.0f} µs")
+    history.close()
+
+if __name__ == "__main__":
+    main()
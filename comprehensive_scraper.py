@@ -4,15 +4,24 @@ Comprehensive historical data scraper for satta-king-fast.com
 Scrapes data from 2015-2024 systematically
 """
 
-import requests
-from bs4 import BeautifulSoup
-import time
-import csv
+import argparse
+import asyncio
+import os
 import re
 import json
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from functools import partial
+
+from fetch_engine import AsyncFetcher, DEFAULT_CONCURRENCY, DEFAULT_RATE
+from adaptive_limiter import DEFAULT_MAX_RATE
+from http_cache import HttpCache
+from page_archive import PageArchive
+from csv_sink import MonthlyCsvSink
+from chart_parser import parse_chart_rows, BACKENDS
+from parse_pipeline import run_pipeline
+from columnar_store import csv_to_columnar
+from url_planner import plan_chart_urls
+from result_row import ResultRow
 
 BASE_URL = "https://satta-king-fast.com/"
 USER_AGENT = "Mozilla/5.0 (compatible; ComprehensiveScraper/1.0)"
@@ -22,183 +31,152 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
-# Thread-safe counter
+# Running total of rows (all updates happen on the event loop thread)
 data_count = 0
-data_lock = threading.Lock()
 
-def scrape_monthly_data(url, year, month):
-    """Scrape monthly data from a specific URL"""
-    global data_count
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        if response.status_code != 200:
-            print(f"❌ Failed {year}-{month:02d}: {response.status_code}")
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the monthly chart table
-        chart_table = soup.find('table', class_='chart-table')
-        if not chart_table:
-            print(f"❌ No chart table found for {year}-{month:02d}")
-            return []
-        
-        # Find all day-number rows
-        day_rows = chart_table.find_all('tr', class_='day-number')
-        
-        monthly_data = []
-        
-        for row in day_rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) < 5:  # Need at least 5 columns
-                continue
-            
-            # Get day number from first cell
-            day_text = cells[0].get_text(strip=True)
-            day_match = re.search(r'(\d{1,2})', day_text)
-            if not day_match:
-                continue
-            
-            day = int(day_match.group(1))
-            if not (1 <= day <= 31):
-                continue
-            
-            # Build date string
-            date_str = f"{year}-{month:02d}-{day:02d}"
-            
-            # Get values from cells 1-4 (DSWR, FRBD, GZBD, GALI)
-            def get_value(cell):
-                val = cell.get_text(strip=True)
-                return "" if val in ["XX", "--", ""] else val
-            
-            entry = {
-                "date": date_str,
-                "dswr": get_value(cells[1]),
-                "frbd": get_value(cells[2]),
-                "gzbd": get_value(cells[3]),
-                "gali": get_value(cells[4]),
-                "source_url": url,
-                "year": year,
-                "month": month,
-                "day": day
-            }
-            
-            monthly_data.append(entry)
+def get_value(text):
+    return "" if text in ["XX", "--", ""] else text
+
+def parse_month_tuples(html, url, year, month, backend="auto"):
+    """
+    Parse the chart-table rows of one monthly page into compact
+    (day, dswr, frbd, gzbd, gali) tuples; None if there is no chart table.
+    Runs in the parse worker processes, so it must stay top-level.
+    """
+    # Cell texts of every day-number row in the monthly chart table
+    day_rows = parse_chart_rows(html, backend)
+    if day_rows is None:
+        return None
+    
+    monthly_data = []
+    
+    for cells in day_rows:
+        if len(cells) < 5:  # Need at least 5 columns
+            continue
         
-        with data_lock:
-            data_count += len(monthly_data)
+        # Get day number from first cell
+        day_match = re.search(r'(\d{1,2})', cells[0])
+        if not day_match:
+            continue
         
-        print(f"✅ {year}-{month:02d}: {len(monthly_data)} days (Total: {data_count})")
-        return monthly_data
+        day = int(day_match.group(1))
+        if not (1 <= day <= 31):
+            continue
         
-    except Exception as e:
-        print(f"❌ Error {year}-{month:02d}: {e}")
-        return []
-
-def generate_urls():
-    """Generate URLs for all months from 2015-2024"""
-    urls = []
-    for year in range(2015, 2025):
-        for month in range(1, 13):
-            # Generate URL for this month/year
-            month_names = [
-                "January", "February", "March", "April", "May", "June",
-                "July", "August", "September", "October", "November", "December"
-            ]
-            month_name = month_names[month - 1]
-            url = f"https://satta-king-fast.com/chart.php?ResultFor={month_name}-{year}&month={month:02d}&year={year}"
-            urls.append((url, year, month))
-    
-    return urls
-
-def scrape_with_threads(max_workers=3):
-    """Scrape data using multiple threads"""
-    urls = generate_urls()
-    all_data = []
+        # Values from cells 1-4 (DSWR, FRBD, GZBD, GALI)
+        monthly_data.append((day, get_value(cells[1]), get_value(cells[2]),
+                             get_value(cells[3]), get_value(cells[4])))
+    
+    return monthly_data
+
+def rows_from_tuples(tuples, url, year, month):
+    """Expand parsed tuples into compact CSV rows"""
+    return [ResultRow(year, month, day, dswr, frbd, gzbd, gali, url) for day, dswr, frbd, gzbd, gali in tuples]
+
+def parse_monthly_page(html, url, year, month, backend="auto"):
+    """Parse one monthly page in-process"""
+    tuples = parse_month_tuples(html, url, year, month, backend)
+    return None if tuples is None else rows_from_tuples(tuples, url, year, month)
+
+async def fetch_month(fetcher, url, year, month):
+    """Fetch the raw bytes of one monthly page (None on failure)"""
+    result = await fetcher.fetch(url)
+    if result.error:
+        print(f"❌ Error {year}-{month:02d}: {result.error}")
+        return None
+    if result.status != 200:
+        print(f"❌ Failed {year}-{month:02d}: {result.status}")
+        return None
+    return result.body
+
+def generate_urls(base_url=BASE_URL, years=range(2015, 2025)):
+    """Generate URLs for all months of the given years (default 2015-2024)"""
+    return plan_chart_urls(base_url, years)
+
+async def scrape_all(urls, concurrency, rate, sink, backend, parse_workers, max_rate=DEFAULT_MAX_RATE,
+                     max_concurrency=None):
+    def on_result(job, tuples):
+        global data_count
+        url, year, month = job
+        if tuples is None:
+            print(f"❌ No chart table found for {year}-{month:02d}")
+            return
+        sink.write_month(rows_from_tuples(tuples, url, year, month))
+        data_count += len(tuples)
+        print(f"✅ {year}-{month:02d}: {len(tuples)} days (Total: {data_count})")
+    
+    async with AsyncFetcher(concurrency=concurrency, rate=rate, headers=HEADERS, cache=HttpCache(), archive=PageArchive(),
+                            max_rate=max_rate, max_concurrency=max_concurrency) as fetcher:
+        await run_pipeline(
+            urls,
+            fetch=lambda job: fetch_month(fetcher, *job),
+            parse=partial(parse_month_tuples, backend=backend),
+            on_result=on_result,
+            io_workers=fetcher.max_concurrency,
+            parse_workers=parse_workers,
+        )
+        for host, limits in fetcher.limits().items():
+            print(f"📈 {host}: settled at {limits['rate']} req/s, concurrency {limits['concurrency']}"
+                  f" ({limits['throttled']} throttled responses)")
+
+def scrape_concurrently(sink, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, base_url=BASE_URL,
+                        backend="auto", parse_workers=None, max_rate=DEFAULT_MAX_RATE, max_concurrency=None):
+    """
+    Scrape every month over one pooled connection, parse pages across all
+    cores, and stream rows into `sink`
+    """
+    urls = generate_urls(base_url)
     
     print(f"🚀 Starting comprehensive scrape of {len(urls)} months...")
     print(f"📅 Years: 2015-2024")
-    print(f"🧵 Using {max_workers} threads")
+    print(f"🔀 Concurrency: {concurrency}, starting rate: {rate} req/s per host (adaptive, max {max_rate})")
+    print(f"🧮 Parse workers: {parse_workers or os.cpu_count()}")
     print("=" * 60)
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_url = {
-            executor.submit(scrape_monthly_data, url, year, month): (url, year, month)
-            for url, year, month in urls
-        }
-        
-        # Process completed tasks
-        for future in as_completed(future_to_url):
-            url, year, month = future_to_url[future]
-            try:
-                data = future.result()
-                all_data.extend(data)
-            except Exception as e:
-                print(f"❌ Thread error for {year}-{month:02d}: {e}")
-            
-            # Be respectful - small delay between requests
-            time.sleep(0.5)
-    
-    return all_data
-
-def save_data(data, filename):
-    """Save data to CSV with comprehensive summary"""
-    if not data:
+    asyncio.run(scrape_all(urls, concurrency, rate, sink, backend, parse_workers, max_rate, max_concurrency))
+
+def save_data(sink):
+    """Merge the streamed months into the CSV and write a comprehensive summary"""
+    sink.close()
+    if not sink.total_rows:
         print("❌ No data to save")
         return
     
-    fieldnames = ["date", "dswr", "frbd", "gzbd", "gali", "source_url", "year", "month", "day"]
-    
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Sort by date
-        for row in sorted(data, key=lambda x: (x["year"] or 0, x["month"] or 0, x["day"] or 0)):
-            writer.writerow(row)
+    print(f"\n✅ Data saved: {sink.total_rows} rows -> {sink.filename}")
     
-    print(f"\n✅ Data saved: {len(data)} rows -> {filename}")
+    # Columnar copy for fast loading
+    col_path, _ = csv_to_columnar(sink.filename)
+    print(f"📦 Columnar copy: {col_path}")
     
     # Generate comprehensive summary
-    years = sorted(set(r["year"] for r in data if r["year"]))
-    months = sorted(set((r["year"], r["month"]) for r in data if r["year"] and r["month"]))
+    years = sink.years()
+    months = sink.months()
+    breakdown = sink.year_breakdown()
     
     print(f"\n📊 COMPREHENSIVE SUMMARY:")
     print(f"📅 Years covered: {years}")
     print(f"📆 Total months: {len(months)}")
-    print(f"📈 Total data points: {len(data)}")
+    print(f"📈 Total data points: {sink.total_rows}")
     
     # Year-by-year breakdown
     print(f"\n📋 YEAR-BY-YEAR BREAKDOWN:")
     for year in years:
-        year_data = [r for r in data if r["year"] == year]
-        months_in_year = len(set(r["month"] for r in year_data))
-        days_in_year = len(year_data)
-        print(f"  {year}: {months_in_year} months, {days_in_year} days")
+        print(f"  {year}: {breakdown[year]['months']} months, {breakdown[year]['days']} days")
     
     # Sample data from each year
     print(f"\n🔍 SAMPLE DATA BY YEAR:")
     for year in years:
-        year_data = [r for r in data if r["year"] == year]
-        if year_data:
-            sample = year_data[0]
+        sample = sink.year_sample(year)
+        if sample:
             print(f"  {year}: {sample['date']} -> DSWR={sample['dswr']}, FRBD={sample['frbd']}, GZBD={sample['gzbd']}, GALI={sample['gali']}")
     
     # Save summary JSON
     summary = {
-        "total_rows": len(data),
+        "total_rows": sink.total_rows,
         "years_covered": years,
         "months_covered": len(months),
         "scraped_at": datetime.now().isoformat(),
-        "year_breakdown": {
-            year: {
-                "months": len(set(r["month"] for r in data if r["year"] == year)),
-                "days": len([r for r in data if r["year"] == year])
-            }
-            for year in years
-        }
+        "year_breakdown": {year: breakdown[year] for year in years}
     }
     
     with open("scraping_summary.json", "w") as f:
@@ -206,7 +184,27 @@ def save_data(data, filename):
     
     print(f"\n📄 Summary saved to: scraping_summary.json")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape 2015-2024 monthly charts")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="starting number of requests in flight per host")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="starting requests per second per host")
+    parser.add_argument("--max-rate", type=float, default=DEFAULT_MAX_RATE,
+                        help="ceiling for the adaptive per-host rate")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="ceiling for requests in flight (default: 4x --concurrency)")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="site root to scrape (point at a local server for testing)")
+    parser.add_argument("--parser", default="auto", choices=["auto"] + sorted(BACKENDS),
+                        help="chart-table parser backend (falls back to bs4 on failure)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="parser processes (default: one per core)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     print("🔍 COMPREHENSIVE SATTA DATA SCRAPER")
     print("=" * 50)
     print("📅 Target: 2015-2024 (10 years)")
@@ -216,8 +214,10 @@ def main():
     
     start_time = datetime.now()
     
-    # Scrape data
-    data = scrape_with_threads(max_workers=3)
+    # Scrape data, streaming each month to disk as it arrives
+    sink = MonthlyCsvSink("comprehensive_historical_data.csv")
+    scrape_concurrently(sink, args.concurrency, args.rate, args.base_url, args.parser,
+                        args.parse_workers, args.max_rate, args.max_concurrency)
     
     end_time = datetime.now()
     duration = end_time - start_time
@@ -225,11 +225,12 @@ def main():
     print(f"\n⏱️  Scraping completed in: {duration}")
     
     # Save data
-    save_data(data, "comprehensive_historical_data.csv")
+    save_data(sink)
     
     print(f"\n🎉 SCRAPING COMPLETE!")
     print(f"📁 Files created:")
     print(f"  - comprehensive_historical_data.csv")
+    print(f"  - comprehensive_historical_data.col")
     print(f"  - scraping_summary.json")
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+SQLite checkpoint store for resumable crawls
+Persists the frontier, the visited set and every row parsed so far. Each page
+is committed in one transaction, so a crash loses at most the page in flight.
+URLs are canonicalized before they are queued; the frontier is served by page
+priority and the visited set holds 64-bit URL fingerprints, not URLs.
+"""
+
+import json
+import sqlite3
+import time
+from itertools import groupby
+
+from crawl_frontier import canonicalize, fingerprint, page_priority
+from result_row import ResultRow
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    depth INTEGER NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS seen (
+    fp INTEGER PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class CrawlCheckpoint:
+    """On-disk crawl state; `seen` holds the fingerprint of every URL ever enqueued"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade()
+
+    def _upgrade(self):
+        """Bring checkpoints written before URL fingerprints up to date"""
+        with self.conn:
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(frontier)")]
+            for column in ("not_before REAL", "attempts INTEGER"):
+                if column.split()[0] not in columns:
+                    self.conn.execute(f"ALTER TABLE frontier ADD COLUMN {column} NOT NULL DEFAULT 0")
+            if "priority" not in columns:
+                self.conn.execute("ALTER TABLE frontier ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+                for url, in self.conn.execute("SELECT url FROM frontier").fetchall():
+                    self.conn.execute("UPDATE frontier SET priority = ? WHERE url = ?",
+                                      (page_priority(url), url))
+            legacy = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'visited'"
+            ).fetchone()
+            if legacy:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen (fp) VALUES (?)",
+                    ((fingerprint(url),) for url, in self.conn.execute("SELECT url FROM visited").fetchall()),
+                )
+                self.conn.execute("DROP TABLE visited")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS frontier_order ON frontier (priority, depth, seq)")
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        with self.conn:
+            for table in ("frontier", "seen", "rows", "meta"):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def _enqueue(self, url, depth):
+        url = canonicalize(url)
+        cur = self.conn.execute("INSERT OR IGNORE INTO seen (fp) VALUES (?)", (fingerprint(url),))
+        if cur.rowcount:
+            self.conn.execute("INSERT INTO frontier (url, depth, priority) VALUES (?, ?, ?)",
+                              (url, depth, page_priority(url)))
+            return True
+        return False
+
+    def seed(self, url, depth=0):
+        with self.conn:
+            return self._enqueue(url, depth)
+
+    def next(self):
+        """
+        Most promising pending (url, depth, attempts) that is due now, or None
+        when nothing is (see next_ready_in)
+        """
+        return self.conn.execute(
+            "SELECT url, depth, attempts FROM frontier WHERE not_before <= ? "
+            "ORDER BY priority, depth, seq LIMIT 1",
+            (time.time(),),
+        ).fetchone()
+
+    def next_ready_in(self):
+        """Seconds until the earliest deferred URL is due, or None when the frontier is empty"""
+        (not_before,) = self.conn.execute("SELECT MIN(not_before) FROM frontier").fetchone()
+        return None if not_before is None else max(0.0, not_before - time.time())
+
+    def defer(self, url, delay, count_attempt=True):
+        """
+        Put `url` back for a retry in `delay` seconds, counting the failed
+        attempt unless no request was sent (e.g. an open circuit breaker)
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET not_before = ?, attempts = attempts + ? WHERE url = ?",
+                (time.time() + delay, int(count_attempt), url),
+            )
+
+    def complete(self, url, rows, links):
+        """
+        Atomically record a fetched page: drop it from the frontier, store its
+        rows, enqueue unseen (url, depth) links. Returns the number enqueued.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM frontier WHERE url = ?", (url,))
+            self.conn.executemany(
+                "INSERT INTO rows (data) VALUES (?)", ((json.dumps(dict(r)),) for r in rows)
+            )
+            added = sum(1 for link, depth in links if self._enqueue(link, depth))
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('pages_visited', '1') "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+        return added
+
+    @property
+    def pages_visited(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'pages_visited'").fetchone()
+        return int(row[0]) if row else 0
+
+    @property
+    def pending(self):
+        return self.conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+
+    @property
+    def row_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def iter_rows(self):
+        for (data,) in self.conn.execute("SELECT data FROM rows ORDER BY id"):
+            yield ResultRow.from_dict(json.loads(data))
+
+    def iter_pages(self):
+        """Rows grouped per page (a page's rows are stored contiguously)"""
+        for _, rows in groupby(self.iter_rows(), key=lambda r: r.get("source_url")):
+            yield list(rows)
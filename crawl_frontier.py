@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier helpers: canonical URLs, page priorities and compact visited sets
+URLs are canonicalized (lower-case host, no fragment or default port, tracking
+parameters dropped, query parameters sorted) so `?month=01&year=2015` and
+`?year=2015&month=01` are the same page. Pending pages are popped from a heap
+ordered by how likely they are to hold a monthly table. Visited pages are
+kept as 64-bit fingerprints (on disk) or in a Bloom filter (in memory)
+instead of full URL strings.
+"""
+
+import hashlib
+import heapq
+import math
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from url_planner import chart_month
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "mc_cid", "mc_eid", "_ga"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Lower sorts first
+PRIORITY_CHART = 0   # chart.php with a month and year
+PRIORITY_CHARTISH = 1  # "chart" or "result" in the path
+PRIORITY_OTHER = 2
+
+def canonicalize(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+def fingerprint(url):
+    """Signed 64-bit hash of the canonical URL (fits an SQLite INTEGER)"""
+    digest = hashlib.blake2b(canonicalize(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def page_priority(url):
+    if chart_month(url) is not None:
+        return PRIORITY_CHART
+    path = urlsplit(url).path.lower()
+    if "chart" in path or "result" in path:
+        return PRIORITY_CHARTISH
+    return PRIORITY_OTHER
+
+class BloomFilter:
+    """Fixed-size Bloom filter; `add` reports whether the key was (probably) new"""
+
+    def __init__(self, capacity, error_rate=1e-6):
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        return all(self.array[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        new = False
+        for p in self._positions(key):
+            byte, bit = p >> 3, 1 << (p & 7)
+            if not self.array[byte] & bit:
+                self.array[byte] |= bit
+                new = True
+        return new
+
+class CrawlFrontier:
+    """
+    In-memory priority frontier: (priority, depth, insertion order) heap of
+    canonical URLs with a Bloom filter of everything ever enqueued. URLs
+    deferred for a retry wait in a second heap keyed by when they are due.
+    """
+
+    def __init__(self, capacity=100000, error_rate=1e-6):
+        self.heap = []
+        self.deferred = []
+        self.seen = BloomFilter(capacity, error_rate)
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap) + len(self.deferred)
+
+    def _push(self, url, depth, attempts):
+        heapq.heappush(self.heap, (page_priority(url), depth, self.seq, url, attempts))
+        self.seq += 1
+
+    def push(self, url, depth):
+        """Enqueue `url` unless an equivalent URL was seen before; returns True if added"""
+        url = canonicalize(url)
+        if not self.seen.add(url):
+            return False
+        self._push(url, depth, 0)
+        return True
+
+    def pop(self):
+        """Most promising (url, depth, attempts) that is due now, or None (see next_ready_in)"""
+        now = time.monotonic()
+        while self.deferred and self.deferred[0][0] <= now:
+            _, _, url, depth, attempts = heapq.heappop(self.deferred)
+            self._push(url, depth, attempts)
+        if not self.heap:
+            return None
+        _, depth, _, url, attempts = heapq.heappop(self.heap)
+        return url, depth, attempts
+
+    def defer(self, url, depth, attempts, delay, count_attempt=True):
+        """
+        Re-queue a popped URL for a retry in `delay` seconds, counting the
+        failed attempt unless no request was sent (e.g. an open circuit breaker)
+        """
+        heapq.heappush(self.deferred, (time.monotonic() + delay, self.seq, url, depth, attempts + int(count_attempt)))
+        self.seq += 1
+
+    def next_ready_in(self):
+        """Seconds until the earliest deferred URL is due, or None when the frontier is empty"""
+        if self.heap:
+            return 0.0
+        if not self.deferred:
+            return None
+        return max(0.0, self.deferred[0][0] - time.monotonic())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV sink for scraper output
+Each month's rows are sorted and spilled to a temporary chunk as they arrive;
+close() merge-sorts the chunks into the final date-ordered CSV. Only one month
+of rows (plus one row per chunk during the merge) is ever held in memory, and
+the year/month breakdown is kept as running counters.
+"""
+
+import csv
+import heapq
+import os
+import shutil
+import tempfile
+from collections import Counter
+
+FIELDNAMES = ["date", "dswr", "frbd", "gzbd", "gali", "source_url", "year", "month", "day"]
+
+# Chunks merged per pass; keeps open file handles well under the OS limit
+MERGE_FAN_IN = 64
+
+def date_sort_key(row):
+    """(year, month, day) as ints; works on fresh rows and on rows read back from CSV"""
+    return (int(row["year"] or 0), int(row["month"] or 0), int(row["day"] or 0))
+
+class MonthlyCsvSink:
+    def __init__(self, filename, fieldnames=FIELDNAMES, sort_key=date_sort_key):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.sort_key = sort_key
+        self.total_rows = 0
+        self.month_days = Counter()   # (year, month) -> rows
+        self.month_samples = {}       # (year, month) -> earliest row
+        self._spill_dir = tempfile.mkdtemp(prefix="csv_sink_")
+        self._chunks = []
+        self._spilled = 0
+
+    def _chunk_path(self):
+        self._spilled += 1
+        return os.path.join(self._spill_dir, f"{self._spilled:06d}.csv")
+
+    def write_month(self, rows):
+        """Spill one batch (normally one month) of rows as a sorted chunk"""
+        if not rows:
+            return
+        rows = sorted(rows, key=self.sort_key)
+        self._chunks.append(self._spill(rows))
+        self.total_rows += len(rows)
+        for row in rows:
+            key = (row.get("year"), row.get("month"))
+            self.month_days[key] += 1
+            sample = self.month_samples.get(key)
+            if sample is None or self.sort_key(row) < self.sort_key(sample):
+                self.month_samples[key] = row
+
+    def _spill(self, rows):
+        path = self._chunk_path()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if self.fieldnames == FIELDNAMES and hasattr(rows[0], "csv_values"):
+                # result_row.ResultRow: one list per row instead of a lookup per field
+                writer = csv.writer(f)
+                writer.writerow(self.fieldnames)
+                writer.writerows(row.csv_values() for row in rows)
+            else:
+                writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+        return path
+
+    def _read(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    def _merge_into(self, paths, out):
+        readers = [self._read(p) for p in paths]
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer.writeheader()
+            for row in heapq.merge(*readers, key=self.sort_key):
+                writer.writerow(row)
+
+    def close(self):
+        """Merge all chunks into `filename` (skipped when nothing was written)"""
+        try:
+            chunks = self._chunks
+            while len(chunks) > MERGE_FAN_IN:
+                merged = []
+                for i in range(0, len(chunks), MERGE_FAN_IN):
+                    out = self._chunk_path()
+                    self._merge_into(chunks[i:i + MERGE_FAN_IN], out)
+                    merged.append(out)
+                chunks = merged
+            if chunks:
+                self._merge_into(chunks, self.filename)
+        finally:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._chunks = []
+
+    def months(self):
+        return sorted(k for k in self.month_days if k[0] and k[1])
+
+    def years(self):
+        return sorted(set(y for y, _ in self.month_days if y))
+
+    def year_breakdown(self):
+        breakdown = {}
+        for (year, month), days in self.month_days.items():
+            if not year:
+                continue
+            entry = breakdown.setdefault(year, {"months": 0, "days": 0})
+            entry["months"] += 1
+            entry["days"] += days
+        return breakdown
+
+    def year_sample(self, year):
+        keys = [k for k in self.month_samples if k[0] == year]
+        if not keys:
+            return None
+        return self.month_samples[min(keys, key=lambda k: k[1] or 0)]
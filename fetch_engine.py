@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Async fetch engine shared by the scrapers
+One pooled keep-alive client with per-host adaptive pacing: each host gets an
+AdaptiveLimiter that starts at `rate` req/s and `concurrency` requests in
+flight, then grows or backs off from the responses (429/503, Retry-After,
+errors, latency) up to `max_rate` / `max_concurrency`.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from adaptive_limiter import AdaptiveLimiter, DEFAULT_MAX_RATE
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0  # starting requests per second, per host
+DEFAULT_TIMEOUT = 15
+
+class FetchResult:
+    """Outcome of a single GET; `error` is set when no response was received"""
+
+    __slots__ = ("url", "status", "body", "headers", "elapsed", "error", "from_cache")
+
+    def __init__(self, url, status=None, body=b"", headers=None, elapsed=0.0, error=None,
+                 from_cache=False):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.error = error
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 200
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+class AsyncFetcher:
+    """
+    Pooled aiohttp client. Use as `async with AsyncFetcher(...) as fetcher`
+    and await `fetcher.fetch(url)` from as many tasks as you like; each host
+    is paced and capped by its own AdaptiveLimiter, and never more than
+    `max_concurrency` requests are in flight overall. With an
+    http_cache.HttpCache, frozen pages never touch the network and everything
+    else is revalidated with a conditional GET. With a page_archive.PageArchive,
+    every page it returns is archived, frozen cache hits included (those only
+    when the archive lacks that copy of the URL).
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, headers=None,
+                 timeout=DEFAULT_TIMEOUT, cache=None, max_rate=DEFAULT_MAX_RATE, max_concurrency=None,
+                 archive=None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_rate = max(max_rate, rate)
+        self.max_concurrency = max(max_concurrency or concurrency * 4, concurrency)
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self._limiters = {}
+        self._in_flight = {}
+        self._gate = None
+        self._session = None
+
+    async def __aenter__(self):
+        self._gate = asyncio.Condition()
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    def limiter(self, url):
+        """The AdaptiveLimiter for `url`'s host"""
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = AdaptiveLimiter(
+                rate=self.rate, concurrency=self.concurrency, max_rate=self.max_rate,
+                max_concurrency=self.max_concurrency,
+            )
+        return limiter
+
+    def limits(self):
+        """Current limiter state per host"""
+        return {host: limiter.snapshot() for host, limiter in self._limiters.items()}
+
+    async def _enter(self, host, limiter):
+        async with self._gate:
+            await self._gate.wait_for(
+                lambda: self._in_flight.get(host, 0) < limiter.concurrency
+                and sum(self._in_flight.values()) < self.max_concurrency
+            )
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+
+    async def _leave(self, host):
+        async with self._gate:
+            self._in_flight[host] -= 1
+            self._gate.notify_all()
+
+    async def fetch(self, url, headers=None):
+        entry = self.cache.load(url) if self.cache else None
+        if entry is not None and self.cache.is_frozen(url, entry):
+            if self.archive:
+                self.archive.put(url, entry.body, fetched_at=entry.fetched_at, if_changed=True)
+            return FetchResult(url, 200, entry.body, entry.headers, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if self.cache:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        host = urlparse(url).netloc
+        limiter = self.limiter(url)
+        await self._enter(host, limiter)
+        try:
+            await limiter.acquire()
+            started = time.monotonic()
+            try:
+                async with self._session.get(url, headers=request_headers) as resp:
+                    body = await resp.read()
+                    result = FetchResult(url, resp.status, body, dict(resp.headers),
+                                         time.monotonic() - started)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                limiter.record(None, time.monotonic() - started)
+                return FetchResult(url, elapsed=time.monotonic() - started,
+                                   error=str(e) or type(e).__name__)
+            limiter.record(result.status, result.elapsed, resp.headers.get("Retry-After"))
+        finally:
+            await self._leave(host)
+
+        if self.cache:
+            if result.status == 304 and entry is not None:
+                self.cache.touch(url, entry)
+                result.status = 200
+                result.body = entry.body
+            elif result.status == 200:
+                self.cache.store(url, result.body, result.headers)
+        if self.archive and result.status == 200:
+            self.archive.put(url, result.body)
+        return result
+
+def fetch_all(urls, **kwargs):
+    """Fetch every URL concurrently and return FetchResults in input order"""
+    async def run():
+        async with AsyncFetcher(**kwargs) as fetcher:
+            return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+    return asyncio.run(run())
@@ -11,6 +11,8 @@ import re
 import json
 from datetime import datetime
 
+from table_schema import TableSchema
+
 BASE_URL = "https://satta-king-fast.com/"
 USER_AGENT = "Mozilla/5.0 (compatible; FixedTestScraper/1.0)"
 
@@ -19,6 +21,8 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
 }
 
+MONTHLY_TABLE = TableSchema(required=("date", "dswr", "gali"))
+
 def scrape_monthly_data(url):
     """Scrape monthly data from a specific URL"""
     print(f"Scraping: {url}")
@@ -40,93 +44,68 @@ def scrape_monthly_data(url):
         print(f"  Year: {year}, Month: {month}")
         
         # Find the monthly data table
-        tables = soup.find_all('table')
         monthly_data = []
         
-        for table in tables:
-            rows = table.find_all('tr')
+        for match in MONTHLY_TABLE.tables(soup):
+            rows = match.table.find_all('tr')
             if len(rows) < 5:  # Skip small tables
                 continue
             
-            # Check if this is the monthly data table
-            first_row = rows[0]
-            headers = [cell.get_text(strip=True) for cell in first_row.find_all(['td', 'th'])]
+            # The monthly data table with DATE, DSWR, FRBD, GZBD, GALI
+            header_map = match.columns
+            print(f"  Found monthly data table with {len(rows)} rows")
+            print(f"  Column mapping: {header_map}")
             
-            # Look for the monthly data table with DATE, DSWR, FRBD, GZBD, GALI
-            if (len(headers) >= 5 and 
-                'DATE' in headers and 
-                'DSWR' in headers and 
-                'GALI' in headers):
+            # Parse data rows
+            data_rows = 0
+            for row in rows[1:]:  # Skip header
+                cells = row.find_all(['td', 'th'])
+                if len(cells) < 5:  # Need at least 5 columns
+                    continue
+                
+                # Get day number from first column
+                day_text = cells[0].get_text(strip=True)
+                day_match = re.search(r'(\d{1,2})', day_text)
+                if not day_match:
+                    continue
                 
-                print(f"  Found monthly data table with {len(rows)} rows")
-                print(f"  Headers: {headers}")
+                day = int(day_match.group(1))
+                if not (1 <= day <= 31):
+                    continue
                 
-                # Map column indices
-                header_map = {}
-                for i, h in enumerate(headers):
-                    if h == 'DATE':
-                        header_map['date'] = i
-                    elif h == 'DSWR':
-                        header_map['dswr'] = i
-                    elif h == 'FRBD':
-                        header_map['frbd'] = i
-                    elif h == 'GZBD':
-                        header_map['gzbd'] = i
-                    elif h == 'GALI':
-                        header_map['gali'] = i
+                # Build date string
+                if year and month:
+                    date_str = f"{year}-{month:02d}-{day:02d}"
+                else:
+                    date_str = f"0000-00-{day:02d}"
                 
-                print(f"  Column mapping: {header_map}")
+                # Get values
+                def get_value(key):
+                    if key in header_map:
+                        val = cells[header_map[key]].get_text(strip=True)
+                        return "" if val in ["XX", "--", ""] else val
+                    return ""
                 
-                # Parse data rows
-                data_rows = 0
-                for row in rows[1:]:  # Skip header
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) < 5:  # Need at least 5 columns
-                        continue
-                    
-                    # Get day number from first column
-                    day_text = cells[0].get_text(strip=True)
-                    day_match = re.search(r'(\d{1,2})', day_text)
-                    if not day_match:
-                        continue
-                    
-                    day = int(day_match.group(1))
-                    if not (1 <= day <= 31):
-                        continue
-                    
-                    # Build date string
-                    if year and month:
-                        date_str = f"{year}-{month:02d}-{day:02d}"
-                    else:
-                        date_str = f"0000-00-{day:02d}"
-                    
-                    # Get values
-                    def get_value(key):
-                        if key in header_map:
-                            val = cells[header_map[key]].get_text(strip=True)
-                            return "" if val in ["XX", "--", ""] else val
-                        return ""
-                    
-                    entry = {
-                        "date": date_str,
-                        "dswr": get_value('dswr'),
-                        "frbd": get_value('frbd'),
-                        "gzbd": get_value('gzbd'),
-                        "gali": get_value('gali'),
-                        "source_url": url,
-                        "year": year,
-                        "month": month,
-                        "day": day
-                    }
-                    
-                    monthly_data.append(entry)
-                    data_rows += 1
-                    
-                    if data_rows <= 5:  # Show first 5 rows
-                        print(f"    Day {day}: DSWR={entry['dswr']}, FRBD={entry['frbd']}, GZBD={entry['gzbd']}, GALI={entry['gali']}")
+                entry = {
+                    "date": date_str,
+                    "dswr": get_value('dswr'),
+                    "frbd": get_value('frbd'),
+                    "gzbd": get_value('gzbd'),
+                    "gali": get_value('gali'),
+                    "source_url": url,
+                    "year": year,
+                    "month": month,
+                    "day": day
+                }
                 
-                print(f"  Extracted {data_rows} data rows")
-                break  # Found the monthly table, stop looking
+                monthly_data.append(entry)
+                data_rows += 1
+                
+                if data_rows <= 5:  # Show first 5 rows
+                    print(f"    Day {day}: DSWR={entry['dswr']}, FRBD={entry['frbd']}, GZBD={entry['gzbd']}, GALI={entry['gali']}")
+            
+            print(f"  Extracted {data_rows} data rows")
+            break  # Found the monthly table, stop looking
         
         return monthly_data
         
@@ -4,16 +4,27 @@ Historical data scraper for satta-king-fast.com
 Optimized to collect DSWR, FRBD, GZBD, GALI data from 2015-2024
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import time
-import csv
 import re
 import json
-from urllib.parse import urljoin, urlparse
-from collections import deque
+from urllib.parse import urljoin
 from datetime import datetime
 
+from crawl_checkpoint import CrawlCheckpoint
+from csv_sink import MonthlyCsvSink
+from columnar_store import csv_to_columnar
+from http_cache import CachedSession
+from chart_parser import chart_table_slice, page_links
+from page_archive import PageArchive
+from adaptive_limiter import AdaptiveLimiter
+from retry_policy import HostBreakers, Rejected, guarded_get
+from table_schema import TableSchema
+from result_row import ResultRow
+from url_planner import is_chart_url, plan_chart_urls
+
 BASE_URL = "https://satta-king-fast.com/"
 USER_AGENT = "Mozilla/5.0 (compatible; HistoricalDataScraper/1.0)"
 
@@ -25,26 +36,38 @@ HEADERS = {
 # Target years
 YEARS = list(range(2015, 2025))  # 2015-2024
 OUTFILE = "historical_satta_data.csv"
+CHECKPOINT_FILE = "historical_crawl.sqlite3"
 
 # Conservative settings
 MAX_PAGES = 1000
-REQUEST_DELAY = 2.0  # 2 seconds between requests
+REQUEST_DELAY = 2.0  # starting gap between requests; adapts to server feedback
 CRAWL_DEPTH_LIMIT = 3
 
-session = requests.Session()
+# Monthly tables must have DATE, GALI and a DSWR/Desawar column
+MONTHLY_TABLE = TableSchema(required=("date", "dswr", "gali"))
+
+session = CachedSession(requests.Session(), archive=PageArchive())
 session.headers.update(HEADERS)
+breakers = HostBreakers()
 
-def safe_get(url, retries=3, backoff=1.0):
-    for attempt in range(retries):
-        try:
-            resp = session.get(url, timeout=20)
-            resp.raise_for_status()
-            return resp
-        except Exception as e:
-            print(f"[WARN] GET {url} failed (attempt {attempt+1}/{retries}): {e}")
-            time.sleep(backoff * (attempt+1))
-    print(f"[ERROR] Failed to fetch {url} after {retries} attempts.")
-    return None
+def safe_get(url, attempt=0, retries=3):
+    """
+    One GET through the host's circuit breaker; never sleeps. Returns
+    (resp, retry_in, rejected): on failure resp is None and retry_in is the
+    jittered delay after which the caller should reschedule the URL, or None
+    once it should be given up. `rejected` is True when the breaker refused
+    the request, which reschedules the URL without using up a retry.
+    """
+    resp, retry_in, error = guarded_get(session, url, breakers, attempt, timeout=20)
+    if resp is not None:
+        return resp, None, False
+    if isinstance(error, Rejected):
+        return None, retry_in, True
+    if retry_in is None or attempt + 1 >= retries:
+        print(f"[ERROR] Failed to fetch {url} after {attempt+1} attempts: {error}")
+        return None, None, False
+    print(f"[WARN] GET {url} failed (attempt {attempt+1}/{retries}): {error}; retrying in {retry_in:.1f}s")
+    return None, retry_in, False
 
 def extract_month_year_from_text(text):
     """Extract year and month from page text"""
@@ -76,49 +99,12 @@ def extract_month_year_from_text(text):
 def parse_monthly_table(page_url, soup):
     """Parse monthly table data"""
     results = []
-    tables = soup.find_all("table")
     
-    for table in tables:
-        # Get headers
-        headers = []
-        thead = table.find("thead")
-        if thead:
-            headers = [th.get_text(separator=" ").strip().lower() for th in thead.find_all(["th","td"])]
-        else:
-            first_row = table.find("tr")
-            if first_row:
-                headers = [c.get_text(separator=" ").strip().lower() for c in first_row.find_all(["th","td"])]
-        
-        if not headers:
-            continue
-        
-        # Check if this is a monthly data table
-        has_date = any("date" in h for h in headers)
-        has_gali = any("gali" in h for h in headers)
-        has_dswr = any("dswr" in h or "desaw" in h for h in headers)
-        
-        if not (has_date and has_gali and has_dswr):
-            continue
-        
-        # Map column indices
-        header_map = {}
-        for idx, h in enumerate(headers):
-            if "date" in h:
-                header_map["date"] = idx
-            elif "dswr" in h or "desaw" in h:
-                header_map["dswr"] = idx
-            elif "frbd" in h or "farid" in h:
-                header_map["frbd"] = idx
-            elif "gzbd" in h or "gzb" in h or "ghazi" in h:
-                header_map["gzbd"] = idx
-            elif "gali" in h:
-                header_map["gali"] = idx
-        
-        if "date" not in header_map or "gali" not in header_map:
-            continue
+    for match in MONTHLY_TABLE.tables(soup):
+        table, header_map = match.table, match.columns
         
         # Get page context for date parsing
-        page_text = (soup.title.string if soup.title else "") + " " + " ".join(h for h in headers)
+        page_text = (soup.title.string if soup.title else "") + " " + match.header_text
         for tag_name in ("h1", "h2", "h3", "h4"):
             tag = soup.find(tag_name)
             if tag and tag.get_text(strip=True):
@@ -177,105 +163,107 @@ def parse_monthly_table(page_url, soup):
                     return ""
                 return val.strip()
             
-            entry = {
-                "date": date_str,
-                "dswr": clean_value(dswr_val),
-                "frbd": clean_value(frbd_val),
-                "gzbd": clean_value(gzbd_val),
-                "gali": clean_value(gali_val),
-                "source_url": page_url,
-                "year": year,
-                "month": month,
-                "day": day
-            }
+            entry = ResultRow(year, month, day, clean_value(dswr_val), clean_value(frbd_val),
+                              clean_value(gzbd_val), clean_value(gali_val), page_url, date_str)
             results.append(entry)
     
     return results
 
-def is_same_domain(url):
-    try:
-        base = urlparse(BASE_URL).netloc
-        return urlparse(url).netloc == base or urlparse(url).netloc.endswith(base)
-    except:
-        return False
-
-def crawl_historical_data():
-    """Crawl and extract historical data"""
-    visited = set()
-    q = deque()
-    q.append((BASE_URL, 0))
-    visited.add(BASE_URL)
-    all_data = []
-    pages_visited = 0
+def crawl_historical_data(checkpoint, base_url=BASE_URL, delay=REQUEST_DELAY):
+    """
+    Fetch one planned chart page per month (plus any chart links they reveal),
+    checkpointing after every page
+    """
+    for url, _, _ in plan_chart_urls(base_url, YEARS):
+        checkpoint.seed(url, 0)
+    session.limiter = AdaptiveLimiter.from_delay(delay)
+    pages_visited = checkpoint.pages_visited
     
     print(f"Starting historical data crawl for years {YEARS[0]}-{YEARS[-1]}...")
-    print(f"Max pages: {MAX_PAGES}, Delay: {REQUEST_DELAY}s")
+    print(f"Max pages: {MAX_PAGES}, starting rate: {session.limiter.rate:.2f} req/s (adaptive)")
+    if pages_visited:
+        print(f"Resuming after {pages_visited} pages ({checkpoint.pending} queued, {checkpoint.row_count} rows so far)")
     
-    while q and pages_visited < MAX_PAGES:
-        url, depth = q.popleft()
+    while pages_visited < MAX_PAGES:
+        item = checkpoint.next()
+        if item is None:
+            wait = checkpoint.next_ready_in()
+            if wait is None:
+                break
+            # Only retries are left and none is due yet
+            time.sleep(wait)
+            continue
+        url, depth, attempt = item
         print(f"\n[INFO] Fetching page {pages_visited+1}/{MAX_PAGES} (depth={depth})")
         print(f"URL: {url}")
         
-        resp = safe_get(url)
+        resp, retry_in, rejected = safe_get(url, attempt)
+        if retry_in is not None:
+            checkpoint.defer(url, retry_in, count_attempt=not rejected)
+            continue
         pages_visited += 1
         
         if resp is None:
+            checkpoint.complete(url, [], [])
             continue
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        # Parse only the chart-table region of the raw bytes (whole page if it can't be cut or has no data)
+        body = resp.content
+        sliced = chart_table_slice(body)
+        soup = BeautifulSoup(sliced or body, "html.parser", from_encoding=resp.encoding)
         
         # Parse tables
         parsed = parse_monthly_table(url, soup)
+        if not parsed and sliced is not None:
+            # The first chart-table is not the data table: search the whole page
+            parsed = parse_monthly_table(url, BeautifulSoup(body, "html.parser", from_encoding=resp.encoding))
         if parsed:
             print(f"[SUCCESS] Found {len(parsed)} data rows")
-            all_data.extend(parsed)
         else:
             print("[INFO] No monthly data found on this page")
         
         # Find links for next pages
+        links = []
         if depth < CRAWL_DEPTH_LIMIT:
-            links_found = 0
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
+            # Links come from the full raw page: the parsed slice has none
+            for href in page_links(body, resp.encoding):
+                href = href.strip()
                 if href.startswith(("javascript:", "#", "mailto:")):
                     continue
                 
                 absolute = urljoin(url, href)
                 absolute = absolute.split("#")[0]
                 
-                if is_same_domain(absolute) and absolute not in visited:
-                    visited.add(absolute)
-                    q.append((absolute, depth + 1))
-                    links_found += 1
-            
-            print(f"Found {links_found} new links to crawl")
+                if is_chart_url(absolute, base_url, YEARS):
+                    links.append((absolute, depth + 1))
         
-        time.sleep(REQUEST_DELAY)
-    
+        links_found = checkpoint.complete(url, parsed, links)
+        if depth < CRAWL_DEPTH_LIMIT:
+            print(f"Found {links_found} new links to crawl")
+            
     print(f"\n[DONE] Pages visited: {pages_visited}")
-    print(f"Total data rows collected: {len(all_data)}")
+    print(f"[RATE] Settled at {session.limiter.rate:.2f} req/s ({session.limiter.throttled} throttled responses)")
+    print(f"Total data rows collected: {checkpoint.row_count}")
     
-    return all_data
+    return checkpoint.row_count
 
-def save_data(data, outfile):
-    """Save data to CSV"""
-    fieldnames = ["date", "dswr", "frbd", "gzbd", "gali", "source_url", "year", "month", "day"]
+def save_data(batches, outfile):
+    """Stream per-page row batches to a date-sorted CSV"""
+    sink = MonthlyCsvSink(outfile)
+    for rows in batches:
+        sink.write_month(rows)
+    sink.close()
     
-    with open(outfile, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Sort by date
-        for row in sorted(data, key=lambda x: (x["year"] or 0, x["month"] or 0, x["day"] or 0)):
-            writer.writerow(row)
-    
-    print(f"[SAVED] {len(data)} rows -> {outfile}")
+    print(f"[SAVED] {sink.total_rows} rows -> {outfile}")
+    if sink.total_rows:
+        col_path, _ = csv_to_columnar(outfile)
+        print(f"[SAVED] Columnar copy -> {col_path}")
     
     # Also save a summary
     summary = {
-        "total_rows": len(data),
-        "years_covered": sorted(set(r["year"] for r in data if r["year"])),
-        "months_covered": sorted(set((r["year"], r["month"]) for r in data if r["year"] and r["month"])),
+        "total_rows": sink.total_rows,
+        "years_covered": sink.years(),
+        "months_covered": sink.months(),
         "scraped_at": datetime.now().isoformat()
     }
     
@@ -284,17 +272,40 @@ def save_data(data, outfile):
     
     print(f"[SUMMARY] Years: {summary['years_covered']}")
     print(f"[SUMMARY] Total months: {len(summary['months_covered'])}")
+    
+    return sink.total_rows
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crawl satta-king-fast.com for 2015-2024 data")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from the last checkpoint instead of starting over")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE,
+                        help="SQLite file holding the crawl state")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="site root to crawl (point at a local server for testing)")
+    parser.add_argument("--delay", type=float, default=REQUEST_DELAY,
+                        help="starting seconds between requests (adapts to server feedback)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    
     print("Historical Satta Data Scraper")
     print("=" * 50)
     
-    data = crawl_historical_data()
+    checkpoint = CrawlCheckpoint(args.checkpoint)
+    if not args.resume:
+        checkpoint.reset()
+    try:
+        total = crawl_historical_data(checkpoint, args.base_url, args.delay)
+        if total:
+            save_data(checkpoint.iter_pages(), OUTFILE)
+    finally:
+        checkpoint.close()
     
-    if data:
-        save_data(data, OUTFILE)
+    if total:
         print(f"\n✅ Scraping completed successfully!")
-        print(f"📊 Collected {len(data)} historical data points")
+        print(f"📊 Collected {total} historical data points")
         print(f"📁 Data saved to: {OUTFILE}")
     else:
         print("\n❌ No data found. Check the website structure or increase crawl limits.")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP cache shared by all scrapers
+Pages are keyed by URL and stored with their ETag/Last-Modified validators so
+re-runs send If-None-Match/If-Modified-Since. Pages for closed months are
+"frozen": once cached after the month ended, they are served from disk
+without any request.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date, datetime
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+CACHE_DIR = ".http_cache"
+KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+def url_month(url):
+    """(year, month) a URL names (?month=..&year=.. or a YYYY-MM path segment), or None"""
+    query = parse_qs(urlparse(url).query)
+    try:
+        return int(query["year"][0]), int(query["month"][0])
+    except (KeyError, ValueError):
+        match = re.search(r"(\d{4})[-/](\d{2})(?!\d)", urlparse(url).path)
+        if not match:
+            return None
+        return int(match.group(1)), int(match.group(2))
+
+def closed_month_policy(url, today=None, fetched_at=None):
+    """
+    Frozen if the URL names a month that has already ended and, when
+    `fetched_at` (ISO timestamp) is given, the copy was fetched after that
+    month ended. A copy taken while the month was still running may miss
+    its last results, so it is not frozen.
+    """
+    month = url_month(url)
+    if month is None:
+        return False
+    year, month = month
+    today = today or date.today()
+    if (year, month) >= (today.year, today.month):
+        return False
+    if fetched_at is None:
+        return True
+    month_end = date(year + month // 12, month % 12 + 1, 1)
+    try:
+        return datetime.fromisoformat(fetched_at).date() >= month_end
+    except (TypeError, ValueError):
+        return False
+
+class CacheEntry:
+    __slots__ = ("url", "body", "headers", "fetched_at")
+
+    def __init__(self, url, body, headers, fetched_at):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.fetched_at = fetched_at
+
+class HttpCache:
+    """URL-keyed store: <root>/<sha[:2]>/<sha>.body plus a .json sidecar"""
+
+    def __init__(self, root=CACHE_DIR, frozen=closed_month_policy):
+        self.root = root
+        self.frozen = frozen
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, key[:2], key)
+
+    def is_frozen(self, url, entry=None):
+        """
+        True if the cached copy of `url` may be served without a request: the
+        policy freezes the URL and the copy was fetched after its month ended.
+        `entry` saves re-reading the sidecar when the caller already loaded it.
+        """
+        if not self.frozen:
+            return False
+        fetched_at = entry.fetched_at if entry is not None else self.fetched_at(url)
+        return fetched_at is not None and bool(self.frozen(url, fetched_at=fetched_at))
+
+    def contains(self, url):
+        return os.path.exists(self._path(url) + ".json")
+
+    def _read_meta(self, url):
+        try:
+            with open(self._path(url) + ".json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def fetched_at(self, url):
+        """When the cached copy was fetched (ISO timestamp), or None if there is none"""
+        meta = self._read_meta(url)
+        return meta.get("fetched_at") if meta else None
+
+    def load(self, url):
+        path = self._path(url)
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(url, body, meta.get("headers", {}), meta.get("fetched_at"))
+
+    def store(self, url, body, headers):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lowered = {k.lower(): v for k, v in headers.items()}
+        kept = {k: lowered[k.lower()] for k in KEPT_HEADERS if k.lower() in lowered}
+        # Body first, sidecar last: a sidecar only ever points at a complete body
+        self._write(path + ".body", body, "wb")
+        self._write_meta(url, kept)
+
+    def touch(self, url, entry):
+        """Record that a revalidation (304) confirmed the cached copy just now"""
+        self._write_meta(url, entry.headers)
+
+    def _write_meta(self, url, headers):
+        meta = {"url": url, "headers": headers, "fetched_at": datetime.now().isoformat()}
+        self._write(self._path(url) + ".json", json.dumps(meta), "w")
+
+    @staticmethod
+    def _write(path, data, mode):
+        tmp = path + ".tmp"
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if "ETag" in entry.headers:
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if "Last-Modified" in entry.headers:
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+def _cached_response(entry):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = entry.url
+    resp._content = entry.body
+    resp.headers.update(entry.headers)
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+class CachedSession:
+    """
+    Wraps a requests.Session. get() serves frozen pages from disk, revalidates
+    the rest, and tags every response with `from_cache` (True when no request
+    was sent). With an adaptive_limiter.AdaptiveLimiter, every request that
+    does go out waits for its slot and reports its outcome back; with a
+    page_archive.PageArchive, every page it returns is archived (frozen pages
+    included, logged only when the archive lacks that copy of the URL).
+    """
+
+    def __init__(self, session=None, cache=None, limiter=None, archive=None):
+        self.session = session or requests.Session()
+        self.cache = cache or HttpCache()
+        self.limiter = limiter
+        self.archive = archive
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def is_fresh(self, url):
+        """True if get(url) would be answered from disk without a request"""
+        return self.cache.is_frozen(url)
+
+    def get(self, url, headers=None, **kwargs):
+        entry = self.cache.load(url)
+        if entry is not None and self.cache.is_frozen(url, entry):
+            # Archived too: pages frozen before the archive existed still land in it
+            if self.archive:
+                self.archive.put(url, entry.body, fetched_at=entry.fetched_at, if_changed=True)
+            resp = _cached_response(entry)
+            resp.from_cache = True
+            return resp
+
+        request_headers = dict(headers or {})
+        request_headers.update(self.cache.conditional_headers(entry))
+        if self.limiter:
+            self.limiter.wait()
+        started = time.monotonic()
+        try:
+            resp = self.session.get(url, headers=request_headers, **kwargs)
+        except requests.RequestException:
+            if self.limiter:
+                self.limiter.record(None, time.monotonic() - started)
+            raise
+        if self.limiter:
+            self.limiter.record(resp.status_code, time.monotonic() - started, resp.headers.get("Retry-After"))
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(url, entry)
+            resp = _cached_response(entry)
+        elif resp.status_code == 200:
+            self.cache.store(url, resp.content, resp.headers)
+        if self.archive and resp.status_code == 200:
+            self.archive.put(url, resp.content)
+        resp.from_cache = False
+        return resp
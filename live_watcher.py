@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Long-running live-result watcher for newghaziabad.com
+Polls the homepage with conditional requests, every few minutes when no
+result is due and every few seconds around each game's result time. Only
+the results table is hashed: when its bytes are unchanged, nothing is
+parsed. When they change, the table is parsed with the newghaziabad
+parser, and every newly filled value is printed and appended to a JSONL
+file the moment it is seen.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import requests
+from bs4 import BeautifulSoup
+
+from newghaziabad_scraper import BASE_URL, GAME_NAMES, HEADERS, page_month, parse_table_rows
+from retry_policy import backoff_delay
+from table_schema import GAME_FIELDS
+
+OUTFILE = "live_results.jsonl"
+
+# Published times in site time (IST, from the site's time table); desawar lands early next morning
+SITE_TZ = timezone(timedelta(hours=5, minutes=30))
+RESULT_TIMES = {"dswr": "05:00", "frbd": "18:00", "gzbd": "21:25", "gali": "23:25"}
+
+FAST_INTERVAL = 5.0      # seconds between polls while a result is due
+IDLE_INTERVAL = 300.0    # seconds between polls far from any result time
+DUE_WINDOW = 45 * 60     # keep polling fast this long after a result time
+MISSING = {"", "--", "XX"}
+
+TABLE_RE = re.compile(rb"<table\b.*?</table\s*>", re.I | re.S)
+GAME_MARKERS = (b"DESAWAR", b"DISAWAR", b"FARIDABAD", b"GHAZIABAD", b"GALI")
+
+def site_now():
+    """Current wall-clock time on the site, as a naive datetime"""
+    return datetime.now(SITE_TZ).replace(tzinfo=None)
+
+def results_region(body):
+    """Raw bytes of the first table whose opening names two or more games, or None"""
+    for match in TABLE_RE.finditer(body):
+        head = match.group(0)[:2048].upper()
+        if sum(marker in head for marker in GAME_MARKERS) >= 2:
+            return match.group(0)
+    return None
+
+def slot_times(now, result_times=RESULT_TIMES):
+    """game -> the result time closest to `now` (yesterday's, today's or tomorrow's)"""
+    slots = {}
+    for game, hhmm in result_times.items():
+        hour, minute = map(int, hhmm.split(":"))
+        today = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        slots[game] = min((today + timedelta(days=d) for d in (-1, 0, 1)), key=lambda t: abs(t - now))
+    return slots
+
+def poll_interval(now, pending, fast=FAST_INTERVAL, idle=IDLE_INTERVAL, due_window=DUE_WINDOW):
+    """
+    Seconds until the next poll. `pending` maps each game whose result has
+    not been seen yet to its result time. A due or overdue result polls
+    every `fast` seconds; an upcoming one a quarter of the remaining time
+    (so polling tightens as it approaches), never overshooting it.
+    """
+    interval = idle
+    for when in pending.values():
+        delta = (when - now).total_seconds()
+        if -due_window <= delta <= 0:
+            return fast
+        if delta > 0:
+            interval = min(interval, delta, max(fast, delta / 4))
+    return interval
+
+class LiveWatcher:
+    def __init__(self, base_url=BASE_URL, outfile=OUTFILE, result_times=RESULT_TIMES,
+                 fast=FAST_INTERVAL, idle=IDLE_INTERVAL, timeout=15):
+        self.url = base_url.rstrip("/") + "/"
+        self.outfile = outfile
+        self.result_times = result_times
+        self.fast = fast
+        self.idle = idle
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.validators = {}
+        self.region_hash = None
+        self.values = None      # (date, game) -> value, None until the first snapshot
+        self.seen_at = {}       # game -> when a new value for it last appeared
+        self.polls = 0
+        self.unchanged = 0
+        self.parsed = 0
+        self.bytes_in = 0
+
+    def fetch(self):
+        """Homepage body, or None when the server answered 304"""
+        resp = self.session.get(self.url, headers=self.validators, timeout=self.timeout)
+        self.bytes_in += len(resp.content)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        self.validators = {}
+        if resp.headers.get("ETag"):
+            self.validators["If-None-Match"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            self.validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        return resp.content
+
+    def poll(self, now=None):
+        """One poll; returns the new results it found (empty on the first snapshot)"""
+        now = now or site_now()
+        self.polls += 1
+        body = self.fetch()
+        if body is None:
+            self.unchanged += 1
+            return []
+        region = results_region(body)
+        digest = hashlib.blake2b(region if region is not None else body, digest_size=16).digest()
+        if digest == self.region_hash:
+            self.unchanged += 1
+            return []
+        self.region_hash = digest
+        self.parsed += 1
+
+        soup = BeautifulSoup(body, "html.parser")
+        year, month = page_month(soup) or (now.year, now.month)
+        rows = parse_table_rows(soup, self.url, year, month)
+        values = {(row["date"], game): row[game] for row in rows for game in GAME_FIELDS}
+        first = self.values is None
+        previous = self.values or {}
+        self.values = values
+
+        events = []
+        for (day, game), value in sorted(values.items()):
+            # The first snapshot only sets the baseline
+            if first or value in MISSING or previous.get((day, game)) == value:
+                continue
+            self.seen_at[game] = now
+            events.append({
+                "date": day,
+                "game": GAME_NAMES[game],
+                "value": value,
+                "previous": previous.get((day, game)),
+                "seen_at": now.isoformat(timespec="seconds"),
+                "source_url": self.url,
+            })
+        if events:
+            with open(self.outfile, "a", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        return events
+
+    def pending(self, now):
+        """game -> result time for every game whose current result has not been seen yet"""
+        slots = slot_times(now, self.result_times)
+        # A value seen shortly before the nominal time still counts for that slot
+        return {game: when for game, when in slots.items()
+                if self.seen_at.get(game, datetime.min) < when - timedelta(minutes=15)}
+
+    def run(self, max_polls=None):
+        failures = 0
+        while max_polls is None or self.polls < max_polls:
+            now = site_now()
+            try:
+                for event in self.poll(now):
+                    print(f"🔔 {event['date']} {event['game'].upper()}: {event['value']} (seen {event['seen_at']})")
+                failures = 0
+            except requests.RequestException as e:
+                print(f"❌ Poll failed: {e}")
+                failures += 1
+            if self.polls == 1 and self.values is not None:
+                print(f"👀 Watching {len(self.values)} cells of {self.url}")
+            now = site_now()
+            wait = poll_interval(now, self.pending(now), self.fast, self.idle)
+            if failures:
+                wait = max(wait, backoff_delay(failures, self.fast, self.idle))
+            time.sleep(wait)
+
+    def stats(self):
+        return {
+            "polls": self.polls,
+            "unchanged": self.unchanged,
+            "parsed": self.parsed,
+            "bytes_in": self.bytes_in,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch newghaziabad.com and emit results as they appear")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--out", default=OUTFILE, help="JSONL file new results are appended to")
+    parser.add_argument("--fast", type=float, default=FAST_INTERVAL, help="seconds between polls while a result is due")
+    parser.add_argument("--idle", type=float, default=IDLE_INTERVAL, help="seconds between polls otherwise")
+    parser.add_argument("--max-polls", type=int, default=None, help="stop after this many polls")
+    args = parser.parse_args()
+
+    watcher = LiveWatcher(args.base_url, args.out, fast=args.fast, idle=args.idle)
+    print(f"🚀 Live watcher started ({date.today()}), results -> {args.out}")
+    try:
+        watcher.run(args.max_polls)
+    except KeyboardInterrupt:
+        pass
+    stats = watcher.stats()
+    print(f"\n📊 {stats['polls']} polls, {stats['unchanged']} unchanged, {stats['parsed']} parsed, {stats['bytes_in']:,} bytes")
+
+if __name__ == "__main__":
+    main()
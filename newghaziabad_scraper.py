@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Month-aware archive scraper for newghaziabad.com
+The homepage only shows the current month; older months come from POSTing
+dd_month/dd_year to index.php. This reads the available years and months
+from that form, fetches every month page concurrently over one pooled
+session, and dates each row by the month the page itself shows. One run
+fills every available year.
+"""
+
+import argparse
+import calendar
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from adaptive_limiter import AdaptiveLimiter
+from csv_sink import FIELDNAMES, MonthlyCsvSink
+from http_cache import HttpCache
+from page_archive import PageArchive
+from retry_policy import RETRYABLE_STATUSES, backoff_delay
+from table_schema import GAME_FIELDS, NAMED_GAMES_TABLE
+from result_row import ResultRow
+from url_planner import MONTH_NAMES
+
+BASE_URL = "https://newghaziabad.com"
+FIRST_YEAR = 2022
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# Output column -> long name used by the older 2025 scripts
+GAME_NAMES = {"frbd": "faridabad", "gzbd": "ghaziabad", "gali": "gali", "dswr": "desawar"}
+MONTH_RE = re.compile(r"\b(" + "|".join(name[:3] for name in MONTH_NAMES) + r")[a-z]*[\s,\-/]*(\d{4})\b", re.I)
+
+def month_url(base_url, year, month):
+    """
+    Key a month page is cached and archived under. The page itself is a POST
+    to index.php; the query string only names the month (and lets the HTTP
+    cache freeze closed months).
+    """
+    return f"{base_url.rstrip('/')}/index.php?month={month:02d}&year={year}"
+
+def url_month(url):
+    """(year, month) named by a month_url key, or None (e.g. the homepage)"""
+    query = parse_qs(urlparse(url).query)
+    year, month = query.get("year", [""])[0], query.get("month", [""])[0]
+    if year.isdigit() and month.isdigit():
+        return int(year), int(month)
+    return None
+
+def _options(soup, name):
+    select = soup.find("select", attrs={"name": name})
+    if select is None:
+        return [], None
+    values, selected = [], None
+    for option in select.find_all("option"):
+        value = (option.get("value") or option.get_text(strip=True)).strip()
+        if value.isdigit():
+            values.append(int(value))
+            if option.has_attr("selected"):
+                selected = int(value)
+    return values, selected
+
+def discover_months(soup, today=None):
+    """(year, month) for every month the site's archive form offers, oldest first, up to today"""
+    today = today or date.today()
+    years, _ = _options(soup, "dd_year")
+    months, _ = _options(soup, "dd_month")
+    years = sorted(y for y in set(years) if 2000 <= y <= today.year) or list(range(FIRST_YEAR, today.year + 1))
+    months = sorted(m for m in set(months) if 1 <= m <= 12) or list(range(1, 13))
+    return [(y, m) for y in years for m in months if (y, m) <= (today.year, today.month)]
+
+def page_month(soup):
+    """(year, month) a results page shows: the form's selected options, else a "Month YYYY" heading"""
+    _, year = _options(soup, "dd_year")
+    _, month = _options(soup, "dd_month")
+    if year and month and 1 <= month <= 12:
+        return year, month
+    for tag in soup.find_all(["h1", "h2", "h3", "h4", "caption", "th"]):
+        match = MONTH_RE.search(tag.get_text(" ", strip=True))
+        if match:
+            return int(match.group(2)), [n[:3].lower() for n in MONTH_NAMES].index(match.group(1)[:3].lower()) + 1
+    return None
+
+def _clean(text):
+    value = re.sub(r"[^\d]", "", text)
+    return value if value else "--"
+
+def parse_table_rows(soup, source_url, year, month):
+    """Rows of the monthly table (FIELDNAMES layout), dated `year`-`month`"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    rows = []
+    for match in NAMED_GAMES_TABLE.tables(soup):
+        trs = match.table.find_all("tr")
+        if len(trs) < 2:
+            continue
+        positions = match.columns
+        games = [column for column in GAME_FIELDS if column in positions]
+
+        for tr in trs[1:]:
+            cells = tr.find_all(["td", "th"])
+            if len(cells) <= max(positions[column] for column in games):
+                continue
+            day_match = re.search(r"\b(\d{1,2})\b", cells[0].get_text(strip=True))
+            if not day_match or not 1 <= int(day_match.group(1)) <= days_in_month:
+                continue
+            day = int(day_match.group(1))
+            values = [_clean(cells[positions[column]].get_text(strip=True)) if column in positions else "--"
+                      for column in GAME_FIELDS]
+            rows.append(ResultRow(year, month, day, *values, source_url))
+        if rows:
+            break
+    return rows
+
+def with_game_names(row):
+    """Copy of a row keyed faridabad/ghaziabad/gali/desawar instead of frbd/gzbd/gali/dswr"""
+    return {GAME_NAMES.get(key, key): row[key] for key in row.keys()}
+
+def read_month_page(url, body):
+    """
+    (month, rows) for one page. Rows are dated by the month the page shows,
+    else the month its key names; a page showing a different month than its
+    key asked for (the site falls back to another month) gives no rows.
+    """
+    soup = BeautifulSoup(body, "html.parser")
+    shown, asked = page_month(soup), url_month(url)
+    found = shown or asked
+    if found is None or (asked and found != asked):
+        return found, []
+    return found, parse_table_rows(soup, url, *found)
+
+def parse_month_page(url, body):
+    return read_month_page(url, body)[1]
+
+class NewGhaziabadScraper:
+    def __init__(self, base_url=BASE_URL, workers=8, delay=0.2, timeout=30, retries=3, cache=None, archive=None):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.cache = cache or HttpCache()
+        self.archive = archive
+        self.limiter = AdaptiveLimiter.from_delay(delay, concurrency=workers, max_concurrency=workers)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.fetched = 0
+        self.from_cache = 0
+
+    def _request(self, method, url, **kwargs):
+        """One request with limiter pacing and jittered retries; returns the body or None"""
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            started = time.monotonic()
+            try:
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                self.limiter.record(None, time.monotonic() - started)
+                error = str(e) or type(e).__name__
+            else:
+                self.limiter.record(resp.status_code, time.monotonic() - started, resp.headers.get("Retry-After"))
+                if resp.status_code == 200:
+                    return resp.content
+                error = f"HTTP {resp.status_code}"
+                if resp.status_code not in RETRYABLE_STATUSES:
+                    break
+            if attempt < self.retries:
+                time.sleep(backoff_delay(attempt))
+        print(f"❌ {method} {url}: {error}")
+        return None
+
+    def fetch_month(self, year, month):
+        """(key, body, from_cache) for one month page; closed months come from the cache once stored"""
+        key = month_url(self.base_url, year, month)
+        entry = self.cache.load(key)
+        if entry is not None and self.cache.is_frozen(key, entry):
+            return key, entry.body, True
+        form = {"dd_month": str(month), "dd_year": str(year), "bt_showresult": "Show Result"}
+        return key, self._request("POST", f"{self.base_url}/index.php", data=form), False
+
+    def _keep(self, url, body, from_cache):
+        if from_cache:
+            self.from_cache += 1
+        else:
+            self.fetched += 1
+        # Cached months too (once per content), so months frozen before the archive existed can be replayed
+        if self.archive is not None:
+            self.archive.put(url, body, if_changed=from_cache)
+
+    def scrape(self, years=None, today=None):
+        """Every row of every available month (optionally only `years`), sorted by date"""
+        today = today or date.today()
+        home = self._request("GET", self.base_url + "/")
+        if home is None:
+            return []
+        self._keep(self.base_url + "/", home, False)
+        soup = BeautifulSoup(home, "html.parser")
+        months = discover_months(soup, today)
+        if years:
+            months = [(y, m) for y, m in months if y in years]
+        print(f"🗓️  {len(months)} month pages available ({months[0][0]}-{months[0][1]:02d} to {months[-1][0]}-{months[-1][1]:02d})" if months else "🗓️  No month pages found")
+
+        by_date = {}
+        current, rows = read_month_page(self.base_url + "/", home)
+        if current and (not years or current[0] in years):
+            for row in rows:
+                by_date.setdefault(row["date"], row)
+            months = [ym for ym in months if ym != current]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = pool.map(lambda ym: self.fetch_month(*ym), months)
+            for (year, month), (key, body, from_cache) in zip(months, results):
+                if body is None:
+                    continue
+                self._keep(key, body, from_cache)
+                found, rows = read_month_page(key, body)
+                if found != (year, month):
+                    # Not cached, so the next run asks again
+                    print(f"⚠️  Asked for {year}-{month:02d}, page shows {found[0]}-{found[1]:02d}; skipped")
+                    continue
+                if rows and not from_cache:
+                    self.cache.store(key, body, {})
+                for row in rows:
+                    by_date.setdefault(row["date"], row)
+                print(f"📅 {year}-{month:02d}: {len(rows)} days{' (cached)' if from_cache else ''}")
+        return [by_date[d] for d in sorted(by_date)]
+
+def _scrape_archived(years=None, base_url=BASE_URL, workers=8, delay=0.2):
+    """(rows, scraper) for a scrape that archives every month page"""
+    archive = PageArchive()
+    scraper = NewGhaziabadScraper(base_url=base_url, workers=workers, delay=delay, archive=archive)
+    try:
+        return scraper.scrape(years), scraper
+    finally:
+        archive.close()
+
+def scrape_archive(years=None, base_url=BASE_URL, workers=8, delay=0.2):
+    """Rows for every available month of newghaziabad.com in FIELDNAMES layout, oldest first"""
+    return _scrape_archived(years, base_url, workers, delay)[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape every month archive page of newghaziabad.com")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--years", type=int, nargs="*", default=None, help="only these years (default: all available)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent month fetches")
+    parser.add_argument("--delay", type=float, default=0.2, help="initial seconds between requests (adapts to the server)")
+    parser.add_argument("--out", default="newghaziabad_archive.csv")
+    args = parser.parse_args()
+
+    print("🚀 Scraping newghaziabad.com month archive")
+    started = time.perf_counter()
+    rows, scraper = _scrape_archived(set(args.years) if args.years else None, args.base_url, args.workers, args.delay)
+
+    sink = MonthlyCsvSink(args.out, FIELDNAMES)
+    sink.write_month(rows)
+    sink.close()
+    print(f"✅ {len(rows)} rows from {scraper.fetched} fetched and {scraper.from_cache} cached pages in {time.perf_counter() - started:.1f}s -> {args.out}")
+    for (year, month), days in sorted(sink.month_days.items()):
+        print(f"   {year}-{month:02d}: {days} days")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of every fetched page
+Bodies are compressed with zstd (gzip when the zstandard package is missing)
+and stored once per distinct content under objects/<sha[:2]>/<sha>.<ext>,
+where sha is the SHA-256 of the raw body. index.jsonl gets one line per
+fetch with the URL, status, content hash and fetch time, so the whole crawl
+can be re-parsed offline (see replay_archive.py). Pages served from a cache
+are logged only when their content differs from the URL's last logged copy.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = "page_archive"
+INDEX_FILE = "index.jsonl"
+
+class PageArchive:
+    def __init__(self, root=ARCHIVE_DIR, level=10):
+        self.root = root
+        self.level = level
+        self._index = None
+        self._last = None
+        self._compressor = zstandard.ZstdCompressor(level=level) if zstandard else None
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _object_path(self, sha, ext):
+        return os.path.join(self.root, "objects", sha[:2], f"{sha}.{ext}")
+
+    def _find(self, sha):
+        for ext in ("zst", "gz"):
+            path = self._object_path(sha, ext)
+            if os.path.exists(path):
+                return path, ext
+        return None, None
+
+    def __contains__(self, sha):
+        return self._find(sha)[0] is not None
+
+    def put(self, url, body, status=200, fetched_at=None, if_changed=False):
+        """
+        Archive one fetched body (stored once per content) and log the fetch;
+        returns its hash. With `if_changed`, nothing is logged when the URL's
+        last logged copy has the same content (e.g. a cache hit on every run).
+        """
+        sha = hashlib.sha256(body).hexdigest()
+        if if_changed and self._last_sha().get(url) == sha:
+            return sha
+        if sha not in self:
+            ext = "zst" if self._compressor else "gz"
+            data = self._compressor.compress(body) if self._compressor else gzip.compress(body, 6)
+            path = self._object_path(sha, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        record = {
+            "url": url,
+            "status": status,
+            "sha256": sha,
+            "size": len(body),
+            "fetched_at": fetched_at or datetime.now().isoformat(),
+        }
+        if self._index is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._index = open(os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8")
+        self._index.write(json.dumps(record) + "\n")
+        self._index.flush()
+        if self._last is not None:
+            self._last[url] = sha
+        return sha
+
+    def _last_sha(self):
+        """{url: content hash of its last logged fetch}, read from the index once"""
+        if self._last is None:
+            self._last = {record["url"]: record["sha256"] for record in self.entries()}
+        return self._last
+
+    def get(self, sha):
+        """Raw body for a content hash"""
+        path, ext = self._find(sha)
+        if path is None:
+            raise KeyError(sha)
+        with open(path, "rb") as f:
+            data = f.read()
+        if ext == "gz":
+            return gzip.decompress(data)
+        if zstandard is None:
+            raise ImportError("zstandard is required to read .zst archive objects")
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def entries(self):
+        """Every index record, oldest first"""
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted run
+                        continue
+
+    def latest(self):
+        """Most recent successful fetch per URL, as {url: record}"""
+        latest = {}
+        for record in self.entries():
+            if record.get("status") == 200:
+                latest[record["url"]] = record
+        return latest
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else ARCHIVE_DIR
+    archive = PageArchive(root)
+    fetches = list(archive.entries())
+    latest = archive.latest()
+    shas = {r["sha256"] for r in fetches}
+    raw = sum(r["size"] for r in fetches)
+    stored = 0
+    for dirpath, _, files in os.walk(os.path.join(root, "objects")):
+        stored += sum(os.path.getsize(os.path.join(dirpath, name)) for name in files)
+    print(f"📦 {len(fetches)} fetches, {len(latest)} URLs, {len(shas)} distinct bodies")
+    if raw:
+        print(f"🗜️  {raw:,} bytes fetched -> {stored:,} bytes stored ({stored / raw:.1%})")
+    archive.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Two-stage fetch/parse pipeline
+I/O coroutines fetch raw page bytes onto a bounded queue; dispatcher
+coroutines hand each page to a ProcessPoolExecutor so parsing runs on every
+core instead of behind the GIL. When parsing falls behind, the full queue
+blocks the fetchers, so at most `queue_size` pages wait in memory.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def _report_error(job, exc):
+    print(f"❌ Parse error for {job}: {exc}")
+
+async def run_pipeline(jobs, fetch, parse, on_result, io_workers=8, parse_workers=None,
+                       queue_size=None, on_error=_report_error):
+    """
+    jobs:      iterable of argument tuples, one per page
+    fetch:     coroutine fetch(job) -> bytes, or None to skip the page
+    parse:     picklable top-level function parse(body, *job) run in a worker
+               process; it should return compact tuples, not rich objects
+    on_result: on_result(job, parsed), called on the event loop thread; if it
+               raises, the run stops and the exception propagates
+    """
+    parse_workers = parse_workers or os.cpu_count() or 1
+    queue = asyncio.Queue(maxsize=queue_size or parse_workers * 2)
+    loop = asyncio.get_running_loop()
+    pending = iter(jobs)
+
+    async def fetcher():
+        for job in pending:
+            body = await fetch(job)
+            if body is not None:
+                await queue.put((job, body))
+
+    async def dispatcher(pool):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            job, body = item
+            try:
+                parsed = await loop.run_in_executor(pool, parse, body, *job)
+            except Exception as e:
+                on_error(job, e)
+                continue
+            on_result(job, parsed)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        dispatchers = [asyncio.create_task(dispatcher(pool)) for _ in range(parse_workers)]
+        fetchers = [asyncio.create_task(fetcher()) for _ in range(io_workers)]
+
+        async def feed():
+            await asyncio.gather(*fetchers)
+            for _ in dispatchers:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(feed())] + dispatchers
+        try:
+            # The first failure (a fetch, or on_result raising in a dispatcher)
+            # ends the run; otherwise the fetchers would block on a full queue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks + fetchers:
+                task.cancel()
+            await asyncio.gather(*tasks, *fetchers, return_exceptions=True)
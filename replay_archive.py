@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Offline re-parse ("replay") of the page archive
+Runs one of the scrapers' parsers over the latest archived copy of every URL
+across all cores, with no network access, and writes the rows to a
+date-sorted CSV. After a parser fix, this re-derives the data in seconds
+instead of re-crawling.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from bs4 import BeautifulSoup
+
+from csv_sink import FIELDNAMES, MonthlyCsvSink
+from page_archive import ARCHIVE_DIR, PageArchive
+from url_planner import chart_month
+
+def replay_chart(url, body):
+    """comprehensive_scraper's chart-table parser; month and year come from the URL"""
+    from comprehensive_scraper import parse_month_tuples, rows_from_tuples
+
+    found = chart_month(url)
+    if found is None:
+        return []
+    year, month = found
+    tuples = parse_month_tuples(body, url, year, month)
+    return rows_from_tuples(tuples, url, year, month) if tuples else []
+
+def replay_historical(url, body):
+    from historical_scraper import parse_monthly_table
+
+    return parse_monthly_table(url, BeautifulSoup(body, "html.parser"))
+
+def replay_satta(url, body):
+    from satta_scraper import parse_table
+
+    return parse_table(url, BeautifulSoup(body, "html.parser"))
+
+def replay_newghaziabad(url, body):
+    from newghaziabad_scraper import parse_month_page
+
+    return parse_month_page(url, body)
+
+REPLAY_PARSERS = {
+    "chart": replay_chart,
+    "historical": replay_historical,
+    "satta": replay_satta,
+    "newghaziabad": replay_newghaziabad,
+}
+
+def replay_sort_key(row):
+    return (row["date"],)
+
+def _replay_page(root, parser, url, sha):
+    body = PageArchive(root).get(sha)
+    return REPLAY_PARSERS[parser](url, body)
+
+def replay(parser, outfile, root=ARCHIVE_DIR, workers=None, match=None):
+    """Re-parse the latest copy of every archived URL; returns (pages, rows)"""
+    latest = PageArchive(root).latest()
+    jobs = sorted((url, r["sha256"]) for url, r in latest.items() if not match or match in url)
+    workers = workers or os.cpu_count() or 1
+    sink = MonthlyCsvSink(outfile, FIELDNAMES, sort_key=replay_sort_key)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            partial(_replay_page, root, parser),
+            [url for url, _ in jobs],
+            [sha for _, sha in jobs],
+            chunksize=max(1, len(jobs) // (workers * 4)),
+        )
+        for rows in results:
+            sink.write_month(rows)
+    sink.close()
+    return len(jobs), sink.total_rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run a parser over the page archive without network")
+    parser.add_argument("--parser", choices=sorted(REPLAY_PARSERS), default="chart")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="page archive directory")
+    parser.add_argument("--out", default="replayed_data.csv", help="CSV to write")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per core)")
+    parser.add_argument("--match", default=None, help="only replay URLs containing this text")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    pages, rows = replay(args.parser, args.out, args.archive, args.workers, args.match)
+    elapsed = time.perf_counter() - started
+    print(f"🔁 Replayed {pages} archived pages with the {args.parser} parser in {elapsed:.2f}s")
+    print(f"✅ {rows} rows -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Compact row type for scraped results
+A ResultRow keeps one day in nine slots instead of a nine-key dict: year,
+month and day as ints (the date string is rebuilt on demand), each game
+result as a small int when it is a two-digit number, and an interned
+source_url shared by every row of its page. It reads like the old dicts
+(row["date"], row.get("gali"), dict(row)), so csv.DictWriter, the CSV sink
+and the summary code take it unchanged.
+"""
+
+import sys
+
+from csv_sink import FIELDNAMES
+
+GAMES = ("dswr", "frbd", "gzbd", "gali")
+KEYS = dict.fromkeys(FIELDNAMES).keys()
+
+def encode_value(text):
+    """Two-digit results become ints 0-99; anything else ("", "--", "5") stays as interned text"""
+    if len(text) == 2 and text.isdigit():
+        return int(text)
+    return sys.intern(text)
+
+def decode_value(value):
+    return f"{value:02d}" if isinstance(value, int) else value
+
+class ResultRow:
+    """
+    One day of results. The game slots hold encoded values (see
+    encode_value); item access returns them as text. `_date` is only set
+    when the date string does not follow from year/month/day (e.g. the
+    "0000-00-DD" rows of pages whose month could not be read).
+    """
+
+    __slots__ = ("year", "month", "day", "dswr", "frbd", "gzbd", "gali", "source_url", "_date")
+
+    def __init__(self, year, month, day, dswr="", frbd="", gzbd="", gali="", source_url="", date=None):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.dswr = encode_value(dswr)
+        self.frbd = encode_value(frbd)
+        self.gzbd = encode_value(gzbd)
+        self.gali = encode_value(gali)
+        self.source_url = sys.intern(source_url or "")
+        self._date = None
+        if date is not None and date != self._canonical_date():
+            self._date = sys.intern(date)
+
+    @classmethod
+    def from_date(cls, date, dswr="", frbd="", gzbd="", gali="", source_url=""):
+        """Row for a YYYY-MM-DD string; year/month/day are read back out of it"""
+        parts = date.split("-")
+        if len(parts) == 3 and all(p.isdigit() for p in parts):
+            year, month, day = (int(p) for p in parts)
+        else:
+            year = month = day = None
+        return cls(year, month, day, dswr, frbd, gzbd, gali, source_url, date)
+
+    @classmethod
+    def from_dict(cls, row):
+        if row.get("year") in (None, "") and row.get("month") in (None, ""):
+            return cls.from_date(row["date"], row.get("dswr", ""), row.get("frbd", ""),
+                                 row.get("gzbd", ""), row.get("gali", ""), row.get("source_url", ""))
+        return cls(
+            _int_or_none(row.get("year")), _int_or_none(row.get("month")), _int_or_none(row.get("day")),
+            row.get("dswr", ""), row.get("frbd", ""), row.get("gzbd", ""), row.get("gali", ""),
+            row.get("source_url", ""), row.get("date"),
+        )
+
+    def _canonical_date(self):
+        if self.year is None or self.month is None or self.day is None:
+            return None
+        return f"{self.year}-{self.month:02d}-{self.day:02d}"
+
+    @property
+    def date(self):
+        return self._date or self._canonical_date()
+
+    def value(self, game):
+        return decode_value(getattr(self, game))
+
+    def keys(self):
+        return KEYS
+
+    def __getitem__(self, key):
+        if key == "date":
+            return self.date
+        if key in GAMES:
+            return decode_value(getattr(self, key))
+        if key in KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in KEYS
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __repr__(self):
+        return f"ResultRow({dict(self)!r})"
+
+    def to_dict(self):
+        return dict(self)
+
+    def csv_values(self):
+        """Field values in FIELDNAMES order, for csv.writer"""
+        return [self.date, decode_value(self.dswr), decode_value(self.frbd), decode_value(self.gzbd),
+                decode_value(self.gali), self.source_url, self.year, self.month, self.day]
+
+def _int_or_none(value):
+    if value is None or value == "":
+        return None
+    return int(value)
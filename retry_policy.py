@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Retry policy for the sync crawlers: per-host circuit breakers and jittered backoff
+guarded_get() makes exactly one attempt and never sleeps. On a retryable
+failure it returns how long to wait, and the crawl loop reschedules the URL
+in its frontier and moves on to other work. After `failure_threshold`
+consecutive failures a host's breaker opens: requests to it fail fast until
+`reset_timeout` has passed, then a single half-open probe decides whether
+to close it again or stay open for twice as long.
+"""
+
+import random
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from adaptive_limiter import parse_retry_after
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full-jitter exponential backoff for the given 0-based attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0, max_reset_timeout=120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.timeout = reset_timeout
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self):
+        """True if a request may go out now (at most one probe while half-open)"""
+        if self.state == self.OPEN and time.monotonic() >= self.opened_at + self.timeout:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return self.state == self.CLOSED
+
+    def retry_in(self):
+        """Seconds until this breaker could let a request through again"""
+        if self.state == self.OPEN:
+            return max(0.0, self.opened_at + self.timeout - time.monotonic())
+        if self.state == self.HALF_OPEN:
+            return self.reset_timeout
+        return 0.0
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.timeout = self.reset_timeout
+        self._probing = False
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self.timeout = min(self.max_reset_timeout, self.timeout * 2)
+            self._open()
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._probing = False
+
+class HostBreakers:
+    """One CircuitBreaker per host, created on first use"""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.breakers = {}
+
+    def get(self, url):
+        host = urlparse(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(**self.kwargs)
+        return breaker
+
+class Rejected:
+    """guarded_get's error when the host's breaker refused the request: nothing was sent"""
+
+    def __init__(self, host, state):
+        self.host = host
+        self.state = state
+
+    def __str__(self):
+        return f"circuit {self.state} for {self.host}"
+
+def guarded_get(session, url, breakers, attempt=0, base_delay=1.0, **kwargs):
+    """
+    One GET through the host's breaker. Returns (resp, retry_in, error):
+    resp on success; otherwise None, the seconds after which a retry makes
+    sense (None if it never does, e.g. a 404) and a description of the error.
+    A Rejected error means the breaker is open and no request went out, so
+    it should not count as a failed attempt. Pages a CachedSession can answer
+    from disk bypass the breaker entirely.
+    """
+    is_fresh = getattr(session, "is_fresh", None)
+    if is_fresh is not None and is_fresh(url):
+        return session.get(url, **kwargs), None, None
+
+    breaker = breakers.get(url)
+    if not breaker.allow():
+        return None, breaker.retry_in() + random.uniform(0, 1), Rejected(urlparse(url).netloc, breaker.state)
+
+    try:
+        resp = session.get(url, **kwargs)
+    except requests.RequestException as e:
+        breaker.record_failure()
+        return None, backoff_delay(attempt, base_delay), str(e) or type(e).__name__
+
+    if resp.status_code < 400:
+        breaker.record_success()
+        return resp, None, None
+    error = f"HTTP {resp.status_code}"
+    if resp.status_code >= 500:
+        breaker.record_failure()
+    else:
+        # 4xx means the host is up, even when it asks us to slow down
+        breaker.record_success()
+    if resp.status_code not in RETRYABLE_STATUSES:
+        return None, None, error
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+    return None, max(backoff_delay(attempt, base_delay), retry_after or 0.0), error
@@ -4,22 +4,33 @@ Scrape DSWR, FRBD, GZBD, GALI daily table data from satta-king-fast.com
 for years 2015 through 2024 and save to satta_2015_2024.csv.
 
 Notes:
-- This script crawls links found on the homepage and follows them (breadth-first),
-  looking for monthly/daily pages that include the target table headers.
+- The crawl is seeded with the chart page of every target month and only follows
+  links that are chart pages for the target years (see url_planner.py), looking
+  for tables that include the target headers.
 - It attempts to infer the year and month from the page title (e.g. "Monthly Satta King Result Chart of October 2025")
   and uses the DATE column (day number) to build YYYY-MM-DD values.
-- It is intentionally conservative: 1 second delay between requests, limited crawl depth,
-  and basic retries on errors.
+- Requests start at one per second and adapt to the server (see adaptive_limiter.py),
+  backing off on 429/503/Retry-After; crawl depth is limited and errors are retried.
 - Before running, please confirm scraping is permitted by the site's robots.txt / terms.
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import time
 import csv
 import re
-from urllib.parse import urljoin, urlparse
-from collections import deque
+from urllib.parse import urljoin
+
+from http_cache import CachedSession
+from chart_parser import chart_table_slice, page_links
+from page_archive import PageArchive
+from adaptive_limiter import AdaptiveLimiter
+from retry_policy import HostBreakers, Rejected, guarded_get
+from url_planner import is_chart_url, plan_chart_urls
+from crawl_frontier import CrawlFrontier
+from table_schema import CHART_TABLE
+from result_row import ResultRow
 
 BASE_URL = "https://satta-king-fast.com/"
 USER_AGENT = "Mozilla/5.0 (compatible; DataScraper/1.0; +https://yourdomain.example/)"
@@ -30,27 +41,36 @@ HEADERS = {
 }
 
 YEARS = set(str(y) for y in range(2015, 2025))  # 2015..2024
+YEARS_INT = range(2015, 2025)
 OUTFILE = "satta_2015_2024.csv"
 
 # Conservative crawling limits
 MAX_PAGES = 2000
-REQUEST_DELAY = 1.0  # seconds
+REQUEST_DELAY = 1.0  # starting seconds between requests; adapts to server feedback
 CRAWL_DEPTH_LIMIT = 4
 
-session = requests.Session()
+session = CachedSession(requests.Session(), archive=PageArchive())
 session.headers.update(HEADERS)
+breakers = HostBreakers()
 
-def safe_get(url, retries=3, backoff=1.0):
-    for attempt in range(retries):
-        try:
-            resp = session.get(url, timeout=20)
-            resp.raise_for_status()
-            return resp
-        except Exception as e:
-            print(f"[WARN] GET {url} failed (attempt {attempt+1}/{retries}): {e}")
-            time.sleep(backoff * (attempt+1))
-    print(f"[ERROR] Failed to fetch {url} after {retries} attempts.")
-    return None
+def safe_get(url, attempt=0, retries=3):
+    """
+    One GET through the host's circuit breaker; never sleeps. Returns
+    (resp, retry_in, rejected): on failure resp is None and retry_in is the
+    jittered delay after which the caller should reschedule the URL, or None
+    once it should be given up. `rejected` is True when the breaker refused
+    the request, which reschedules the URL without using up a retry.
+    """
+    resp, retry_in, error = guarded_get(session, url, breakers, attempt, timeout=20)
+    if resp is not None:
+        return resp, None, False
+    if isinstance(error, Rejected):
+        return None, retry_in, True
+    if retry_in is None or attempt + 1 >= retries:
+        print(f"[ERROR] Failed to fetch {url} after {attempt+1} attempts: {error}")
+        return None, None, False
+    print(f"[WARN] GET {url} failed (attempt {attempt+1}/{retries}): {error}; retrying in {retry_in:.1f}s")
+    return None, retry_in, False
 
 def extract_month_year_from_text(text):
     # Look for phrases like "October 2025", "October, 2025", "Oct 2025", or year in text
@@ -84,49 +104,11 @@ def parse_table(page_url, soup):
     Return list of dicts: {date, dswr, frbd, gzbd, gali, source_url}
     """
     results = []
-    # search for all tables
-    tables = soup.find_all("table")
-    target_headers = ["date", "dswr", "frbd", "gzbd", "gali", "desawer", "desawer".lower()]
-    for table in tables:
-        # try to get header texts
-        headers = []
-        thead = table.find("thead")
-        if thead:
-            headers = [th.get_text(separator=" ").strip().lower() for th in thead.find_all(["th","td"])]
-        else:
-            # maybe first row is header
-            first_row = table.find("tr")
-            if first_row:
-                headers = [c.get_text(separator=" ").strip().lower() for c in first_row.find_all(["th","td"])]
-        if not headers:
-            continue
-        # Check if we have at least date and gali (and others). The site uses variations like "DSWR" or "DSWR" for Desawer.
-        has_gali = any("gali" in h for h in headers)
-        has_date = any("date" in h or re.match(r"^\s*date\s*$", h) for h in headers)
-        if not (has_gali and has_date):
-            continue
-        # Map header indices
-        header_map = {}
-        for idx,h in enumerate(headers):
-            key = None
-            if "date" in h:
-                key = "date"
-            elif "dswr" in h or "desaw" in h or "desawer" in h or "dswr" in h:
-                key = "dswr"
-            elif "frbd" in h or "farid" in h:
-                key = "frbd"
-            elif "gzbd" in h or "gzb" in h:
-                key = "gzbd"
-            elif "gali" in h or "gali" in h:
-                key = "gali"
-            if key:
-                header_map[key] = idx
-        # if we don't have at least date and gali and one other, skip
-        if "date" not in header_map or "gali" not in header_map:
-            continue
+    for match in CHART_TABLE.tables(soup):
+        table, header_map = match.table, match.columns
 
         # Determine month+year from page title or headings
-        page_text = (soup.title.string if soup.title else "") + " " + " ".join(h for h in headers)
+        page_text = (soup.title.string if soup.title else "") + " " + match.header_text
         # Also look for an h1/h2 that contains month/year
         for tagname in ("h1","h2","h3","h4"):
             tag = soup.find(tagname)
@@ -190,44 +172,49 @@ def parse_table(page_url, soup):
             gali_val = cell_text(header_map["gali"]) if "gali" in header_map else ""
 
             # Normalize empty strings and remove weird whitespace
-            entry = {
-                "date": date_str,
-                "dswr": dswr_val.strip(),
-                "frbd": frbd_val.strip(),
-                "gzbd": gzbd_val.strip(),
-                "gali": gali_val.strip(),
-                "source_url": page_url
-            }
+            entry = ResultRow.from_date(date_str, dswr_val.strip(), frbd_val.strip(), gzbd_val.strip(),
+                                        gali_val.strip(), page_url)
             results.append(entry)
 
     return results
 
-def is_same_domain(url):
-    try:
-        base = urlparse(BASE_URL).netloc
-        return urlparse(url).netloc == base or urlparse(url).netloc.endswith(base)
-    except:
-        return False
-
-def crawl_and_extract():
-    visited = set()
-    q = deque()
-    q.append((BASE_URL, 0))
-    visited.add(BASE_URL)
+def crawl_and_extract(base_url=BASE_URL, delay=REQUEST_DELAY):
+    session.limiter = AdaptiveLimiter.from_delay(delay)
+    frontier = CrawlFrontier(capacity=MAX_PAGES * 10)
+    # Start from the known chart page of every target month
+    for url, _, _ in plan_chart_urls(base_url, YEARS_INT):
+        frontier.push(url, 0)
     all_data = []
     pages_visited = 0
 
-    while q and pages_visited < MAX_PAGES:
-        url, depth = q.popleft()
+    while pages_visited < MAX_PAGES:
+        item = frontier.pop()
+        if item is None:
+            wait = frontier.next_ready_in()
+            if wait is None:
+                break
+            # Only retries are left and none is due yet
+            time.sleep(wait)
+            continue
+        url, depth, attempt = item
         print(f"[INFO] Fetching ({pages_visited+1}/{MAX_PAGES}) depth={depth}: {url}")
-        resp = safe_get(url)
+        resp, retry_in, rejected = safe_get(url, attempt)
+        if retry_in is not None:
+            frontier.defer(url, depth, attempt, retry_in, count_attempt=not rejected)
+            continue
         pages_visited += 1
         if resp is None:
             continue
-        soup = BeautifulSoup(resp.text, "html.parser")
+        # Parse only the chart-table region of the raw bytes (whole page if it can't be cut or has no data)
+        body = resp.content
+        sliced = chart_table_slice(body)
+        soup = BeautifulSoup(sliced or body, "html.parser", from_encoding=resp.encoding)
 
         # Parse the page for tables
         parsed = parse_table(url, soup)
+        if not parsed and sliced is not None:
+            # The first chart-table is not the data table: search the whole page
+            parsed = parse_table(url, BeautifulSoup(body, "html.parser", from_encoding=resp.encoding))
         if parsed:
             print(f"[INFO] -> Found {len(parsed)} rows on {url}")
             # filter rows to selected years only
@@ -247,29 +234,25 @@ def crawl_and_extract():
 
         # Enqueue links (respect depth limit)
         if depth < CRAWL_DEPTH_LIMIT:
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
+            # Links come from the full raw page: the parsed slice has none
+            for href in page_links(body, resp.encoding):
+                href = href.strip()
                 if href.startswith("javascript:") or href.startswith("#") or href.lower().startswith("mailto:"):
                     continue
                 absolute = urljoin(url, href)
-                # only same domain
-                if not is_same_domain(absolute):
+                # only chart pages for the target years
+                if not is_chart_url(absolute, base_url, YEARS_INT):
                     continue
-                # remove fragments
-                absolute = absolute.split("#")[0]
-                if absolute not in visited:
-                    visited.add(absolute)
-                    q.append((absolute, depth+1))
-
-        time.sleep(REQUEST_DELAY)
+                frontier.push(absolute, depth+1)
 
     print(f"[DONE] pages visited: {pages_visited}, total rows collected (pre-filter): {len(all_data)}")
+    print(f"[RATE] Settled at {session.limiter.rate:.2f} req/s ({session.limiter.throttled} throttled responses)")
     return all_data
 
 def save_csv(rows, outfile):
     fieldnames = ["date","dswr","frbd","gzbd","gali","source_url"]
     with open(outfile, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
         writer.writeheader()
         # sort rows by date for nicer file (ignores '0000-00' entries)
         def sort_key(r):
@@ -278,9 +261,18 @@ def save_csv(rows, outfile):
             writer.writerow(r)
     print(f"[SAVED] {len(rows)} rows -> {outfile}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crawl satta-king-fast.com for 2015-2024 tables")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="site root to crawl (point at a local server for testing)")
+    parser.add_argument("--delay", type=float, default=REQUEST_DELAY,
+                        help="starting seconds between requests (adapts to server feedback)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("Scraper starting. Please ensure scraping is permitted by site's robots.txt / terms.")
-    data = crawl_and_extract()
+    data = crawl_and_extract(args.base_url, args.delay)
     if data:
         save_csv(data, OUTFILE)
     else:
@@ -1,139 +1,21 @@
 #!/usr/bin/env python3
 """
 Comprehensive scraper for newghaziabad.com to get 2025 data
-Handles different table structures and gets all available data
+Gets every available month archive page, not just the homepage
 """
 
-import requests
-from bs4 import BeautifulSoup
 import csv
 import json
-import re
-from datetime import datetime, timedelta
+
+from newghaziabad_scraper import scrape_archive, with_game_names
 
 def scrape_2025_comprehensive():
-    """Comprehensive scraper for 2025 data"""
-    
-    url = "https://newghaziabad.com"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    """Comprehensive scraper for 2025 (and earlier) data"""
     
-    try:
-        print("🔍 Fetching comprehensive 2025 data from newghaziabad.com...")
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for all tables
-        tables = soup.find_all('table')
-        print(f"📊 Found {len(tables)} tables")
-        
-        all_data = []
-        
-        for table_idx, table in enumerate(tables):
-            print(f"\n🔍 Analyzing table {table_idx + 1}...")
-            
-            rows = table.find_all('tr')
-            if len(rows) < 2:
-                continue
-            
-            # Get header row
-            header_row = rows[0]
-            header_cells = header_row.find_all(['td', 'th'])
-            headers = [cell.get_text(strip=True).upper() for cell in header_cells]
-            
-            print(f"📋 Headers: {headers}")
-            
-            # Check if this table has our target fields
-            target_fields = ['FARIDABAD', 'GHAZIABAD', 'GALI', 'DESAWAR']
-            found_fields = [field for field in target_fields if any(field in header for header in headers)]
-            
-            if len(found_fields) < 2:
-                print(f"❌ Table {table_idx + 1} doesn't have enough target fields")
-                continue
-            
-            print(f"✅ Found fields: {found_fields}")
-            
-            # Map field positions
-            field_positions = {}
-            for i, header in enumerate(headers):
-                for field in target_fields:
-                    if field in header:
-                        field_positions[field] = i
-                        break
-            
-            print(f"📍 Field positions: {field_positions}")
-            
-            # Extract data rows - be more flexible with day detection
-            for row_idx, row in enumerate(rows[1:], 1):
-                cells = row.find_all(['td', 'th'])
-                if len(cells) < max(field_positions.values()) + 1:
-                    continue
-                
-                # Try to extract day from any cell in the row
-                day = None
-                for cell in cells:
-                    day_text = cell.get_text(strip=True)
-                    day_match = re.search(r'\b(\d{1,2})\b', day_text)
-                    if day_match:
-                        potential_day = int(day_match.group(1))
-                        if 1 <= potential_day <= 31:
-                            day = potential_day
-                            break
-                
-                if not day:
-                    continue
-                
-                # Create row data
-                row_data = {
-                    'date': f"2025-01-{day:02d}",
-                    'year': 2025,
-                    'month': 1,
-                    'day': day,
-                    'source_url': url
-                }
-                
-                # Extract values for each field
-                for field, pos in field_positions.items():
-                    if pos < len(cells):
-                        value_text = cells[pos].get_text(strip=True)
-                        clean_value = re.sub(r'[^\d]', '', value_text)
-                        field_key = field.lower()
-                        row_data[field_key] = clean_value if clean_value else '--'
-                    else:
-                        field_key = field.lower()
-                        row_data[field_key] = '--'
-                
-                all_data.append(row_data)
-                print(f"📅 Day {day}: {dict((k, v) for k, v in row_data.items() if k in ['faridabad', 'ghaziabad', 'gali', 'desawar'])}")
-        
-        # If we didn't get much data, try to generate some sample data for 2025
-        if len(all_data) < 10:
-            print("\n🔄 Generating additional 2025 sample data...")
-            for day in range(1, 32):  # Generate for all days of January
-                if not any(record['day'] == day for record in all_data):
-                    sample_data = {
-                        'date': f"2025-01-{day:02d}",
-                        'year': 2025,
-                        'month': 1,
-                        'day': day,
-                        'source_url': url,
-                        'faridabad': f"{50 + (day % 10)}",  # Sample data
-                        'ghaziabad': f"{55 + (day % 10)}",
-                        'gali': f"{60 + (day % 10)}",
-                        'desawar': f"{45 + (day % 10)}"
-                    }
-                    all_data.append(sample_data)
-                    print(f"📅 Generated Day {day}: FRBD={sample_data['faridabad']}, GZBD={sample_data['ghaziabad']}, GALI={sample_data['gali']}, DSWR={sample_data['desawar']}")
-        
-        print(f"\n✅ Total records: {len(all_data)}")
-        return all_data
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return []
+    print("🔍 Fetching month archive pages from newghaziabad.com...")
+    all_data = [with_game_names(row) for row in scrape_archive()]
+    print(f"\n✅ Scraped {len(all_data)} records")
+    return all_data
 
 def save_data(data):
     """Save data to files"""
@@ -163,6 +45,6 @@ if __name__ == "__main__":
     data = scrape_2025_comprehensive()
     if data:
         save_data(data)
-        print(f"✅ Success! Generated {len(data)} records for 2025")
+        print(f"✅ Success! Scraped {len(data)} records")
     else:
         print("❌ No data scraped")
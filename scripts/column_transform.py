@@ -0,0 +1,101 @@
+"""
+Streaming, atomic column transforms for CSV files.
+
+Rows are read lazily in fixed-size chunks. Each rule receives one column of
+a chunk as a list and returns the new list, so a rule works on a whole batch
+of values at a time, and memory stays bounded by the chunk size however long
+the file is. Output goes to a temporary file next to the target, which is
+flushed, fsynced and renamed over it only once every row is written. An
+interrupted run leaves the original file untouched.
+
+Usage:
+  from column_transform import fill_missing, random_two_digit, transform_csv
+
+  transform_csv('data.csv', {'DESAWAR1': fill_missing(random_two_digit())})
+"""
+
+import csv
+import os
+import random
+import shutil
+import tempfile
+from itertools import islice
+
+CHUNK_ROWS = 10000
+
+
+def is_missing(value):
+    return value is None or value.strip() == ''
+
+
+def random_two_digit(seed=None):
+    """Maker of n random 'NN' strings (00-99) per call"""
+    rng = random.Random(seed)
+    return lambda n: [f'{v:02d}' for v in rng.choices(range(100), k=n)]
+
+
+def fill_missing(make_values):
+    """Rule: replace empty values with values from make_values(n), one batch per chunk"""
+    def rule(values):
+        holes = [i for i, value in enumerate(values) if is_missing(value)]
+        if holes:
+            for i, value in zip(holes, make_values(len(holes))):
+                values[i] = value
+        return values
+    return rule
+
+
+def chunks(reader, size):
+    while True:
+        chunk = list(islice(reader, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def transform_csv(path, rules, out_path=None, chunk_rows=CHUNK_ROWS):
+    """
+    Apply `rules` (column -> rule) to every row of `path` and write the
+    result to `out_path` (default: `path` itself) atomically. Columns a rule
+    names that the file lacks are added at the end. A row with more cells
+    than the header is an error (and leaves the file untouched). Returns the
+    row count.
+    """
+    out_path = out_path or path
+    directory = os.path.dirname(os.path.abspath(out_path))
+    rows = 0
+    with open(path, 'r', newline='') as src:
+        reader = csv.reader(src)
+        header = next(reader, None)
+        if header is None:
+            raise SystemExit(f'{path} is empty')
+        fieldnames = header + [c for c in rules if c not in header]
+        positions = [(fieldnames.index(c), rule) for c, rule in rules.items()]
+        width = len(fieldnames)
+
+        fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(out_path) + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', newline='') as dst:
+                writer = csv.writer(dst)
+                writer.writerow(fieldnames)
+                # Blank lines are dropped, as csv.DictReader did
+                for chunk in chunks((row for row in reader if row), chunk_rows):
+                    for i, row in enumerate(chunk):
+                        if len(row) > len(header):
+                            # An extra cell would be read as the first added column
+                            raise SystemExit(f'{path}: data row {rows + i + 1} has {len(row)} cells for {len(header)} columns')
+                        row.extend([''] * (width - len(row)))
+                    for idx, rule in positions:
+                        for row, value in zip(chunk, rule([row[idx] for row in chunk])):
+                            row[idx] = value
+                    writer.writerows(chunk)
+                    rows += len(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+            if os.path.exists(out_path):
+                shutil.copymode(out_path, tmp)
+            os.replace(tmp, out_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return rows
@@ -0,0 +1,235 @@
+"""
+Delta sync of the result CSVs into Postgres: push only rows that changed.
+
+A local manifest keeps one content hash per date and table from the last
+successful sync, plus a mask of the columns that held a value. Each run reads the CSV (with the same row rules as
+pg_bulk_load), hashes every row, and pushes only the new and changed dates
+through pg_bulk_load's COPY + ON CONFLICT merge, so a daily run costs one
+day of results, not the whole history. The manifest is updated (atomically)
+only after the push succeeded. Every run writes a JSON diff report:
+
+  {"table", "source", "generated_at", "dry_run",
+   "summary": {"rows", "new", "changed", "not_applied", "unchanged", "removed", "skipped", "pushed"},
+   "months": {"YYYY-MM": {"new": [dates], "changed": [dates], "not_applied": [dates], "removed": [dates]}},
+   "rows": [{"date", "status", "values": {column: value}, "cleared": [columns]}]}
+
+"not_applied" dates clear a value that was synced before. The merge never
+overwrites a stored value with NULL, so the database keeps the old value;
+such a date keeps its old manifest entry and is reported on every run until
+the CSV or the database is fixed by hand. "removed" lists dates in the
+manifest, inside the file's date range, that the file no longer has; they
+are reported, not deleted.
+
+Usage:
+  python scripts/delta_sync.py comprehensive_historical_data.csv
+  python scripts/delta_sync.py --dry-run newghaziabad_archive.csv       # report only
+  python scripts/delta_sync.py --full dummy_gali1_2015_to_today.csv     # push every row, refresh hashes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from psycopg_pool import ConnectionPool
+
+from pg_bulk_load import CHUNK_ROWS, TABLES, TEXT_COLUMNS, load_rows, read_rows, table_for
+
+MANIFEST_PATH = 'delta_sync_manifest.json'
+REPORT_PATH = 'delta_sync_report.json'
+
+
+def row_digest(row):
+    """Short content hash of a (date, value, ...) row's values"""
+    text = '\x1f'.join('' if v is None else v for v in row[1:])
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def row_entry(row):
+    """Manifest entry: 'digest:mask', the mask marking the columns that hold a value"""
+    mask = sum(1 << i for i, v in enumerate(row[1:]) if v is not None)
+    return f'{row_digest(row)}:{mask:x}'
+
+
+def split_entry(entry):
+    digest, _, mask = entry.partition(':')
+    return digest, int(mask or '0', 16)
+
+
+def load_manifest(path):
+    """table -> {date: digest}"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def diff_rows(rows, known, columns, full=False):
+    """
+    Compare rows (one per date) with the last synced entries. Returns a dict
+    with the rows to push, the manifest entries to record, {date: status},
+    {date: cleared columns}, every date seen and the unchanged/empty counts.
+
+    The merge never overwrites a stored value with NULL, so a row that
+    clears a synced value is "not_applied": its remaining values are pushed,
+    but it keeps its old manifest entry and is reported again next run.
+    With `full`, unchanged rows are pushed (and recorded) as well.
+    """
+    diff = {'push': [], 'entries': {}, 'status': {}, 'cleared': {}, 'dates': set(), 'unchanged': 0, 'empty': 0}
+    results = sum(1 << i for i, c in enumerate(columns) if c not in TEXT_COLUMNS)
+    for row in rows:
+        day, entry = row[0], row_entry(row)
+        diff['dates'].add(day)
+        previous = known.get(day)
+        if previous == entry and not full:
+            diff['unchanged'] += 1
+            continue
+        _, mask = split_entry(entry)
+        old_mask = split_entry(previous)[1] if previous else 0
+        lost = old_mask & ~mask
+        if lost:
+            diff['status'][day] = 'not_applied'
+            diff['cleared'][day] = [c for i, c in enumerate(columns) if lost >> i & 1]
+            if mask & results:
+                diff['push'].append(row)
+            continue
+        if not mask & results:
+            # No result to store (the loader skips such rows too)
+            diff['empty'] += 1
+            continue
+        diff['push'].append(row)
+        diff['entries'][day] = entry
+        if previous == entry:
+            diff['unchanged'] += 1
+        else:
+            diff['status'][day] = 'new' if previous is None else 'changed'
+    return diff
+
+
+def build_report(table, path, diff, known, skipped, pushed, dry_run):
+    columns = [c for c, _ in TABLES[table]]
+    status = diff['status']
+    removed = []
+    if diff['dates']:
+        first, last = min(diff['dates']), max(diff['dates'])
+        removed = sorted(d for d in known if first <= d <= last and d not in diff['dates'])
+
+    kinds = ('new', 'changed', 'not_applied', 'removed')
+    months = {}
+    for day, kind in sorted(status.items()):
+        months.setdefault(day[:7], {k: [] for k in kinds})[kind].append(day)
+    for day in removed:
+        months.setdefault(day[:7], {k: [] for k in kinds})['removed'].append(day)
+
+    counts = dict.fromkeys(('new', 'changed', 'not_applied'), 0)
+    for kind in status.values():
+        counts[kind] += 1
+    rows = []
+    for row in sorted((r for r in diff['push'] if r[0] in status), key=lambda r: r[0]):
+        item = {'date': row[0], 'status': status[row[0]], 'values': dict(zip(columns, row[1:]))}
+        if row[0] in diff['cleared']:
+            item['cleared'] = diff['cleared'][row[0]]
+        rows.append(item)
+    pushed_dates = {row[0] for row in diff['push']}
+    for day in sorted(d for d in diff['cleared'] if d not in pushed_dates):
+        rows.append({'date': day, 'status': 'not_applied', 'values': {}, 'cleared': diff['cleared'][day]})
+    return {
+        'table': table,
+        'source': path,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'dry_run': dry_run,
+        'summary': {
+            'rows': len(diff['dates']) - diff['empty'],
+            'new': counts['new'],
+            'changed': counts['changed'],
+            'not_applied': counts['not_applied'],
+            'unchanged': diff['unchanged'],
+            'removed': len(removed),
+            'skipped': skipped + diff['empty'],
+            'pushed': pushed,
+        },
+        'months': {month: months[month] for month in sorted(months)},
+        'rows': rows,
+    }
+
+
+def delta_sync(path, manifest, pool=None, table=None, full=False, chunk_rows=CHUNK_ROWS, workers=4):
+    """
+    Diff `path` against `manifest` (updated in place) and push new/changed
+    rows through `pool`; with no pool nothing is pushed or recorded. Returns
+    the report.
+    """
+    table = table or table_for(path)
+    known = manifest.get(table, {})
+    rows, skipped = read_rows(path, table, keep_empty=True)
+    diff = diff_rows(rows, known, [c for c, _ in TABLES[table]], full)
+
+    pushed = 0
+    if pool is not None and diff['push']:
+        _, pushed = load_rows(pool, table, diff['push'], chunk_rows, workers)
+    if pool is not None:
+        manifest.setdefault(table, {}).update(diff['entries'])
+    return build_report(table, path, diff, known, skipped[0], pushed, pool is None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Push only new and changed result rows to Postgres')
+    parser.add_argument('files', nargs='+', help='CSV files (comprehensive_historical_data.csv, scraper output, dummy_gali1_*.csv)')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help='Postgres connection string (default: $DATABASE_URL)')
+    parser.add_argument('--table', choices=sorted(TABLES), default=None, help='target table (default: from the CSV header)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='hashes from the last successful sync')
+    parser.add_argument('--report', default=REPORT_PATH, help='JSON diff report (one entry per file)')
+    parser.add_argument('--dry-run', action='store_true', help='report the diff without pushing or updating the manifest')
+    parser.add_argument('--full', action='store_true', help='push every row, not only changed ones, and refresh their hashes')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=4, help='chunks loaded in parallel, one connection each')
+    args = parser.parse_args()
+
+    if not args.dry_run and not args.dsn:
+        raise SystemExit('❌ No database: pass --dsn, set DATABASE_URL, or use --dry-run')
+
+    manifest = load_manifest(args.manifest)
+    reports = []
+    pool = None
+    if not args.dry_run:
+        pool = ConnectionPool(args.dsn, min_size=1, max_size=args.workers, open=True)
+    try:
+        for path in args.files:
+            started = time.perf_counter()
+            report = delta_sync(path, manifest, pool, args.table, args.full, args.chunk_rows, args.workers)
+            reports.append(report)
+            if pool is not None:
+                save_manifest(args.manifest, manifest)
+            s = report['summary']
+            print(f"{'🔍' if args.dry_run else '✅'} {path} -> {report['table']}: {s['new']} new, {s['changed']} changed, "
+                  f"{s['unchanged']} unchanged, {s['removed']} removed, {s['pushed']} pushed in {time.perf_counter() - started:.2f}s")
+            if s['not_applied']:
+                print(f"⚠️  {s['not_applied']} dates clear stored values, which the merge keeps; see the report's not_applied rows")
+    finally:
+        if pool is not None:
+            pool.close()
+
+    with open(args.report, 'w') as f:
+        json.dump(reports, f, indent=2)
+    print(f'📄 Report: {args.report}')
+
+
+if __name__ == '__main__':
+    main()
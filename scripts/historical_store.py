@@ -0,0 +1,163 @@
+"""
+Date-indexed access to a historical results CSV.
+
+The index is a sorted list of ordinal days with the byte offset of each row,
+so a date, month, year or range lookup is a bisect plus a seek per matching
+row instead of a scan of the whole file. It is saved next to the CSV as
+<name>.idx.json and rebuilt automatically when the CSV changes.
+
+Usage:
+  python scripts/historical_store.py comprehensive_historical_data.csv 2019-07
+"""
+
+import calendar
+import csv
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+def index_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.idx.json'
+
+
+def _ordinal(value):
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class HistoricalStore:
+    def __init__(self, path, date_field='date'):
+        self.path = path
+        self.date_field = date_field
+        self._file = open(path, 'rb')
+        if not self._load_index():
+            self._build_index()
+            self._save_index()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    # -- index ------------------------------------------------------------
+
+    def _source_stamp(self):
+        st = os.stat(self.path)
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def _load_index(self):
+        try:
+            with open(index_path(self.path)) as f:
+                idx = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if idx.get('source') != self._source_stamp() or idx.get('date_field') != self.date_field:
+            return False
+        self.fieldnames = idx['fieldnames']
+        self.ordinals = idx['ordinals']
+        self.offsets = idx['offsets']
+        return True
+
+    def _build_index(self):
+        self._file.seek(0)
+        header = self._file.readline().decode('utf-8')
+        self.fieldnames = next(csv.reader([header]))
+        if self.date_field not in self.fieldnames:
+            raise SystemExit(f'{self.path} must contain a {self.date_field} column')
+        col = self.fieldnames.index(self.date_field)
+
+        entries = []
+        offset = self._file.tell()
+        for line in iter(self._file.readline, b''):
+            values = next(csv.reader([line.decode('utf-8')]), [])
+            day = _ordinal(values[col]) if len(values) > col else None
+            if day is not None:
+                entries.append((day, offset))
+            offset += len(line)
+        entries.sort()
+        self.ordinals = [d for d, _ in entries]
+        self.offsets = [o for _, o in entries]
+
+    def _save_index(self):
+        idx = {
+            'source': self._source_stamp(),
+            'date_field': self.date_field,
+            'fieldnames': self.fieldnames,
+            'ordinals': self.ordinals,
+            'offsets': self.offsets,
+        }
+        tmp = index_path(self.path) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(idx, f)
+        os.replace(tmp, index_path(self.path))
+
+    # -- queries ----------------------------------------------------------
+
+    def _row_at(self, offset, games=None):
+        self._file.seek(offset)
+        values = next(csv.reader([self._file.readline().decode('utf-8')]))
+        row = dict(zip(self.fieldnames, values))
+        if games is not None:
+            row = {k: row.get(k, '') for k in [self.date_field, *games]}
+        return row
+
+    def dates(self):
+        """Sorted ISO dates of all indexed rows (duplicates included)"""
+        return [date.fromordinal(d).isoformat() for d in self.ordinals]
+
+    def range(self, start, end, games=None):
+        """Rows with start <= date <= end (dates or ISO strings), in date order"""
+        lo = bisect_left(self.ordinals, _as_date(start).toordinal())
+        hi = bisect_right(self.ordinals, _as_date(end).toordinal())
+        return [self._row_at(self.offsets[i], games) for i in range(lo, hi)]
+
+    def get(self, day, games=None):
+        """
+        Row for one date, or None (also for strings that are not dates). A
+        date that appears more than once gives its last row in the file, as
+        a {date: row} dict would.
+        """
+        target = day.toordinal() if isinstance(day, date) else _ordinal(day)
+        if target is None:
+            return None
+        # Ties in the index are ordered by byte offset, so the last one is the last row
+        i = bisect_right(self.ordinals, target) - 1
+        if i >= 0 and self.ordinals[i] == target:
+            return self._row_at(self.offsets[i], games)
+        return None
+
+    def month(self, year, month, games=None):
+        last = calendar.monthrange(year, month)[1]
+        return self.range(date(year, month, 1), date(year, month, last), games)
+
+    def year(self, year, games=None):
+        return self.range(date(year, 1, 1), date(year, 12, 31), games)
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def main():
+    if len(sys.argv) < 3:
+        raise SystemExit('usage: historical_store.py CSV YYYY-MM [GAME ...]')
+    path, month_key, games = sys.argv[1], sys.argv[2], sys.argv[3:] or None
+    year, month = (int(p) for p in month_key.split('-'))
+    with HistoricalStore(path) as store:
+        print(json.dumps(store.month(year, month, games), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Streaming merge-join of date-sorted CSV files.
+
+Every source is read once, front to back, and rows are matched on the date
+column with a heap merge, so memory stays constant however long the files
+are. The first source is the base; each later source brings some columns
+and a precedence rule for them:
+
+  keep       the value already in the output wins; the source only supplies
+             columns the output does not have yet for that date
+  fill       replaces values that are missing ('' by default)
+  overwrite  replaces the value whenever the source has a row for the date
+
+Rows whose date is not a real YYYY-MM-DD date (e.g. a repeated header row)
+are skipped and counted. A date repeated within one source keeps that
+source's last row. A source that is not in date order is an error.
+
+Usage:
+  python scripts/merge_join.py OUT.csv BASE.csv OTHER.csv [OTHER.csv ...]
+      [--columns Gali1,GALI1] [--rule fill] [--how outer] [--default --]
+"""
+
+import argparse
+import csv
+import os
+from datetime import date
+from heapq import merge
+from itertools import groupby
+
+KEEP = 'keep'
+FILL = 'fill'
+OVERWRITE = 'overwrite'
+RULES = (KEEP, FILL, OVERWRITE)
+
+
+def _valid_date(value):
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return len(value) == 10
+
+
+class Source:
+    """One input: its path, the columns it contributes and their rules"""
+
+    def __init__(self, path, columns=None, rule=FILL, rules=None, key='date'):
+        if rule not in RULES:
+            raise ValueError(f'unknown rule {rule!r} (expected one of {", ".join(RULES)})')
+        self.path = path
+        self.columns = columns
+        self.rule = rule
+        self.rules = rules or {}
+        self.key = key
+        self.fieldnames = None
+        self.skipped = 0
+        self.duplicates = 0
+
+    def rule_for(self, column):
+        return self.rules.get(column, self.rule)
+
+    def open(self):
+        self._file = open(self.path, 'r', newline='')
+        reader = csv.DictReader(self._file)
+        self.fieldnames = reader.fieldnames or []
+        if self.key not in self.fieldnames:
+            raise SystemExit(f'{self.path} must contain a {self.key} column')
+        if self.columns is None:
+            self.columns = [f for f in self.fieldnames if f != self.key]
+        missing = [c for c in self.columns if c not in self.fieldnames]
+        if missing:
+            raise SystemExit(f'{self.path} has no {", ".join(missing)} column')
+        return reader
+
+    def close(self):
+        self._file.close()
+
+    def rows(self, reader, index):
+        """
+        (date, index, row) in date order; the index breaks ties in source
+        order. A repeated date keeps its last row, as the old {date: row}
+        lookups did.
+        """
+        pending = None
+        for row in reader:
+            day = row.get(self.key)
+            if not _valid_date(day):
+                self.skipped += 1
+                continue
+            if pending is not None:
+                if day == pending[0]:
+                    self.duplicates += 1
+                    pending = (day, index, row)
+                    continue
+                if day < pending[0]:
+                    raise SystemExit(
+                        f'{self.path} is not sorted by {self.key}: {day} after {pending[0]} (line {reader.line_num})'
+                    )
+                yield pending
+            pending = (day, index, row)
+        if pending is not None:
+            yield pending
+
+
+def output_fields(sources):
+    fields = list(sources[0].fieldnames)
+    for source in sources[1:]:
+        fields.extend(c for c in source.columns if c not in fields)
+    return fields
+
+
+def merge_rows(sources, how='outer', default='', missing=('',)):
+    """
+    Yield merged output rows (dicts) in date order. `how` is 'outer' (every
+    date of every source) or 'left' (only dates of the base source). Sources
+    must already be opened with Source.open.
+    """
+    base = sources[0]
+    fields = output_fields(sources)
+    streams = [source.rows(source.reader, i) for i, source in enumerate(sources)]
+    for day, group in groupby(merge(*streams), key=lambda item: item[0]):
+        group = list(group)
+        if how == 'left' and group[0][1] != 0:
+            continue
+        out = dict.fromkeys(fields, default)
+        present = set()
+        for _, index, row in group:
+            if index == 0:
+                out.update((f, row.get(f, default)) for f in base.fieldnames)
+                present.update(base.fieldnames)
+                continue
+            source = sources[index]
+            for column in source.columns:
+                value = row.get(column, '')
+                rule = source.rule_for(column)
+                if column not in present:
+                    out[column] = value
+                    present.add(column)
+                elif rule == OVERWRITE or (rule == FILL and out[column] in missing and value not in missing):
+                    out[column] = value
+        out[base.key] = day
+        yield out
+
+
+def merge_join(out_path, sources, how='outer', default='', missing=('',)):
+    """Merge `sources` (Source objects, base first) into `out_path`; returns the rows written"""
+    for source in sources:
+        source.reader = source.open()
+    try:
+        fields = output_fields(sources)
+        written = 0
+        tmp = out_path + '.tmp'
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in merge_rows(sources, how, default, missing):
+                writer.writerow(row)
+                written += 1
+    finally:
+        for source in sources:
+            source.close()
+    os.replace(tmp, out_path)
+    for source in sources:
+        if source.skipped or source.duplicates:
+            print(f'{source.path}: skipped {source.skipped} rows without a date, {source.duplicates} repeated dates')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge date-sorted CSV files in one streaming pass')
+    parser.add_argument('out', help='CSV to write')
+    parser.add_argument('base', help='base CSV; its columns and values come first')
+    parser.add_argument('others', nargs='+', help='CSVs merged into the base, in precedence order')
+    parser.add_argument('--columns', default=None, help='comma-separated columns taken from the other files (default: all)')
+    parser.add_argument('--rule', choices=RULES, default=FILL, help='how the other files treat existing values')
+    parser.add_argument('--how', choices=('outer', 'left'), default='outer', help='outer: all dates; left: base dates only')
+    parser.add_argument('--default', default='', help='value for columns a date has no source for')
+    args = parser.parse_args()
+
+    columns = args.columns.split(',') if args.columns else None
+    sources = [Source(args.base)] + [Source(path, columns, args.rule) for path in args.others]
+    written = merge_join(args.out, sources, args.how, args.default)
+    print(f'Wrote {written} rows to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
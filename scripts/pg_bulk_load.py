@@ -0,0 +1,255 @@
+"""
+Bulk loader from the result CSVs into the Postgres tables of supabase-schema.sql.
+
+The CSV is streamed in chunks. Each chunk is COPYed into a temporary staging
+table on a pooled connection and merged into the target with one
+INSERT ... SELECT ... ON CONFLICT (date) DO UPDATE, so a full reload is a
+handful of statements instead of one REST upsert per 100 rows. Chunks load
+in parallel; every chunk is its own transaction, and rerunning a load is
+harmless (rows that did not change are not rewritten).
+
+Values follow the migrate-*-to-supabase.ts scripts: '--' and empty cells
+are NULL, single digits are zero-padded, rows without a YYYY-MM-DD date or
+without any result are skipped. A NULL never overwrites a stored value.
+Input must be sorted by date (as the scrapers' CSV sink writes it); a
+repeated date keeps its last row, so every date is loaded by exactly one
+chunk.
+
+Usage:
+  python scripts/pg_bulk_load.py comprehensive_historical_data.csv            # -> scraped_results
+  python scripts/pg_bulk_load.py dummy_gali1_2015_to_today.csv                # -> admin_results
+  python scripts/pg_bulk_load.py --dsn postgresql://localhost/test --init-schema supabase-schema.sql FILE.csv
+
+The connection string comes from --dsn or DATABASE_URL (for Supabase, the
+project's Postgres connection string, not the REST URL). Needs psycopg 3 and
+its pool: pip install "psycopg[binary,pool]".
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from psycopg import sql
+from psycopg_pool import ConnectionPool
+
+CHUNK_ROWS = 50000
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# table -> (column, CSV headers it is read from, in order of preference)
+TABLES = {
+    'scraped_results': [
+        ('faridabad', ('frbd', 'faridabad')),
+        ('ghaziabad', ('gzbd', 'ghaziabad')),
+        ('gali', ('gali',)),
+        ('desawar', ('dswr', 'desawar')),
+        ('source_url', ('source_url',)),
+    ],
+    'admin_results': [
+        ('gal12', ('GALI2',)),
+        ('desawar2', ('DESAWAR2',)),
+        ('faridabad2', ('FARIDABAD2',)),
+        ('ghaziabad2', ('GHAZIABAD2',)),
+        ('luxmi_kuber', ('LUXMI KUBER',)),
+    ],
+}
+TEXT_COLUMNS = {'source_url'}
+
+
+def detect_table(header):
+    """The table whose columns the CSV header covers best"""
+    def score(table):
+        return sum(any(h in header for h in headers) for _, headers in TABLES[table])
+    table = max(TABLES, key=score)
+    if score(table) == 0:
+        raise SystemExit(f'No result columns in header: {", ".join(header)}')
+    return table
+
+
+def result_value(text):
+    """A VARCHAR(2) result, or None for '--', empty and over-long cells"""
+    text = (text or '').strip()
+    if not text or text == '--' or len(text) > 2:
+        return None
+    return text.zfill(2)
+
+
+def read_rows(path, table, keep_empty=False):
+    """
+    (row iterator, skipped) for one date-sorted CSV. Rows are (date, value,
+    ...) tuples in TABLES[table] column order, one per date: a repeated date
+    keeps its last row, so no date is ever split across two chunks (whose
+    parallel merges would race). Rows without any result are dropped unless
+    `keep_empty`. skipped[0] counts dropped rows once the iterator is
+    exhausted. Input that is not in date order is an error.
+    """
+    skipped = [0]
+
+    def dated_rows():
+        with open(path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            if 'date' not in header:
+                raise SystemExit(f'{path} must contain a date column')
+            idx_date = header.index('date')
+            positions = []
+            for column, headers in TABLES[table]:
+                found = next((header.index(h) for h in headers if h in header), None)
+                positions.append((found, column in TEXT_COLUMNS))
+            width = len(header)
+            for parts in reader:
+                if len(parts) < width:
+                    parts.extend([''] * (width - len(parts)))
+                day = parts[idx_date].strip()
+                if not DATE_RE.match(day):
+                    skipped[0] += 1
+                    continue
+                values = [
+                    None if idx is None else ((parts[idx].strip() or None) if is_text else result_value(parts[idx]))
+                    for idx, is_text in positions
+                ]
+                yield reader.line_num, (day, *values)
+
+    result_slots = [i + 1 for i, (column, _) in enumerate(TABLES[table]) if column not in TEXT_COLUMNS]
+
+    def last_per_date():
+        pending = None
+        for line, row in dated_rows():
+            if pending is not None:
+                if row[0] < pending[0]:
+                    raise SystemExit(f'{path} is not sorted by date: {row[0]} after {pending[0]} (line {line})')
+                if row[0] == pending[0]:
+                    skipped[0] += 1
+                else:
+                    yield pending
+            pending = row
+        if pending is not None:
+            yield pending
+
+    def rows():
+        for row in last_per_date():
+            if keep_empty or any(row[i] is not None for i in result_slots):
+                yield row
+            else:
+                skipped[0] += 1
+
+    return rows(), skipped
+
+
+def merge_statement(table):
+    """INSERT ... ON CONFLICT merge from the `stage` temp table into `table`"""
+    columns = [sql.Identifier(c) for c, _ in TABLES[table]]
+    target = sql.Identifier(table)
+    return sql.SQL(
+        'INSERT INTO {target} (date, {cols}) '
+        'SELECT DISTINCT ON (date) date, {cols} FROM stage ORDER BY date, seq DESC '
+        'ON CONFLICT (date) DO UPDATE SET {sets}, updated_at = NOW() '
+        'WHERE ({current}) IS DISTINCT FROM ({merged})'
+    ).format(
+        target=target,
+        cols=sql.SQL(', ').join(columns),
+        sets=sql.SQL(', ').join(
+            sql.SQL('{c} = COALESCE(EXCLUDED.{c}, {t}.{c})').format(c=c, t=target) for c in columns
+        ),
+        current=sql.SQL(', ').join(sql.SQL('{t}.{c}').format(t=target, c=c) for c in columns),
+        merged=sql.SQL(', ').join(
+            sql.SQL('COALESCE(EXCLUDED.{c}, {t}.{c})').format(c=c, t=target) for c in columns
+        ),
+    )
+
+
+def stage_statement(table):
+    columns = sql.SQL(', ').join(
+        sql.SQL('{} {}').format(sql.Identifier(c), sql.SQL('TEXT' if c in TEXT_COLUMNS else 'VARCHAR(2)'))
+        for c, _ in TABLES[table]
+    )
+    return sql.SQL('CREATE TEMP TABLE stage (seq INTEGER, date DATE, {}) ON COMMIT DROP').format(columns)
+
+
+def copy_statement(table):
+    columns = sql.SQL(', ').join(sql.Identifier(c) for c, _ in TABLES[table])
+    return sql.SQL('COPY stage (seq, date, {}) FROM STDIN').format(columns)
+
+
+def load_chunk(pool, table, rows):
+    """COPY one chunk into a staging table and merge it; returns the number of rows written"""
+    with pool.connection() as conn:
+        with conn.transaction(), conn.cursor() as cur:
+            cur.execute(stage_statement(table))
+            with cur.copy(copy_statement(table)) as copy:
+                for seq, row in enumerate(rows):
+                    copy.write_row((seq, *row))
+            cur.execute(merge_statement(table))
+            return cur.rowcount
+
+
+def init_schema(pool, schema_path):
+    """Run the CREATE TABLE / CREATE INDEX statements of a schema file (not its policies)"""
+    with open(schema_path, 'r') as f:
+        text = re.sub(r'--[^\n]*', '', f.read())
+    statements = [s.strip() for s in text.split(';') if re.match(r'\s*CREATE\s+(TABLE|INDEX)', s, re.I)]
+    with pool.connection() as conn:
+        for statement in statements:
+            conn.execute(statement)
+
+
+def table_for(path):
+    with open(path, 'r', newline='') as f:
+        return detect_table(next(csv.reader(f), []))
+
+
+def load_rows(pool, table, rows, chunk_rows=CHUNK_ROWS, workers=4):
+    """Load an iterable of row tuples in parallel chunks; returns (rows read, rows written)"""
+    rows = iter(rows)
+    read = written = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            read += len(chunk)
+            pending.add(executor.submit(load_chunk, pool, table, chunk))
+            # Keep at most `workers` chunks queued behind the running ones
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += sum(f.result() for f in done)
+        written += sum(f.result() for f in pending)
+    return read, written
+
+
+def bulk_load(pool, path, table=None, chunk_rows=CHUNK_ROWS, workers=4):
+    """Stream `path` into `table` (detected from the header when None); returns (table, rows read, rows written, skipped)"""
+    table = table or table_for(path)
+    rows, skipped = read_rows(path, table)
+    read, written = load_rows(pool, table, rows, chunk_rows, workers)
+    return table, read, written, skipped[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='COPY result CSVs into scraped_results / admin_results')
+    parser.add_argument('files', nargs='+', help='CSV files (comprehensive_historical_data.csv, scraper output, dummy_gali1_*.csv)')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help='Postgres connection string (default: $DATABASE_URL)')
+    parser.add_argument('--table', choices=sorted(TABLES), default=None, help='target table (default: from the CSV header)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=4, help='chunks loaded in parallel, one connection each')
+    parser.add_argument('--init-schema', metavar='SQL', default=None, help='create the tables from this schema file first')
+    args = parser.parse_args()
+
+    if not args.dsn:
+        raise SystemExit('❌ No database: pass --dsn or set DATABASE_URL')
+
+    with ConnectionPool(args.dsn, min_size=1, max_size=args.workers, open=True) as pool:
+        if args.init_schema:
+            init_schema(pool, args.init_schema)
+        for path in args.files:
+            started = time.perf_counter()
+            table, read, written, skipped = bulk_load(pool, path, args.table, args.chunk_rows, args.workers)
+            print(f'✅ {path} -> {table}: {read} rows loaded, {written} inserted/updated, {skipped} skipped in {time.perf_counter() - started:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
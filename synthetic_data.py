@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic result histories for load testing
+Builds a whole history at once with NumPy: one uint8 column per game for
+every day of the requested years (MISSING marks a day without a result),
+then writes it in one of the project's layouts in fixed-size chunks. The
+same seed always gives the same file, so benchmarks of the merge scripts,
+the loaders and the web app can be rerun at any volume (e.g. 100x today's
+data) in seconds.
+
+Layouts:
+  historical  comprehensive_historical_data.csv (csv_sink.FIELDNAMES)
+  admin       dummy_gali1_2015_to_today.csv (date + admin categories)
+  monthly     monthly_results.json ({"YYYY-MM": {month, fields, rows}})
+A .json --out for historical/admin writes a list of row objects instead.
+"""
+
+import argparse
+import csv
+import json
+import time
+
+import numpy as np
+
+from csv_sink import FIELDNAMES
+from url_planner import chart_url
+
+BASE_URL = "https://satta-king-fast.com/"
+HISTORICAL_GAMES = ("dswr", "frbd", "gzbd", "gali")
+ADMIN_GAMES = ("GALI2", "DESAWAR2", "FARIDABAD2", "GHAZIABAD2", "LUXMI KUBER")
+MONTHLY_GAMES = ("desawar", "firozabad", "disawar", "faridabad", "ghaziabad", "gali")
+LAYOUTS = {"historical": HISTORICAL_GAMES, "admin": ADMIN_GAMES, "monthly": MONTHLY_GAMES}
+
+MISSING = 255
+CHUNK_ROWS = 100_000
+# "00".."99", then "" for MISSING
+VALUE_TEXT = np.array([f"{v:02d}" for v in range(100)] + [""], dtype=object)
+
+class SyntheticHistory:
+    """
+    `days` (datetime64[D]) and `values` (uint8, days x games) for every day
+    from January of the first year to December of the last.
+    """
+
+    def __init__(self, years, games, seed=0, missing_rate=0.01):
+        first, last = min(years), max(years)
+        self.games = list(games)
+        self.days = np.arange(np.datetime64(f"{first:04d}-01-01"), np.datetime64(f"{last + 1:04d}-01-01"))
+        rng = np.random.default_rng(seed)
+        self.values = rng.integers(0, 100, size=(len(self.days), len(self.games)), dtype=np.uint8)
+        if missing_rate > 0:
+            self.values[rng.random(self.values.shape) < missing_rate] = MISSING
+
+    def __len__(self):
+        return len(self.days)
+
+    def chunks(self, size=CHUNK_ROWS):
+        """(days, values) slices of at most `size` rows"""
+        for start in range(0, len(self.days), size):
+            yield self.days[start:start + size], self.values[start:start + size]
+
+def date_parts(days):
+    """(date strings, years, months, days of month) for a datetime64[D] array"""
+    months = days.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month_numbers = months.astype(np.int64) % 12 + 1
+    day_numbers = (days - months).astype(np.int64) + 1
+    return np.datetime_as_string(days, unit="D"), years, month_numbers, day_numbers
+
+def value_columns(values):
+    """One list of "NN"/"" strings per game column"""
+    text = VALUE_TEXT[np.minimum(values, 100)]
+    return [column.tolist() for column in text.T]
+
+def _month_urls(years, months, base_url):
+    """Chart URL per row, formatted once per month"""
+    keys = years * 12 + (months - 1)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    urls = np.array([chart_url(base_url, k // 12, k % 12 + 1) for k in unique.tolist()], dtype=object)
+    return urls[inverse].tolist()
+
+def historical_columns(days, values, games, base_url):
+    """(fieldnames, columns) in the comprehensive_historical_data.csv layout, extra games at the end"""
+    dates, years, months, day_numbers = date_parts(days)
+    by_game = dict(zip(games, value_columns(values)))
+    fields = list(FIELDNAMES) + [g for g in games if g not in FIELDNAMES]
+    columns = {
+        "date": dates.tolist(),
+        "source_url": _month_urls(years, months, base_url),
+        "year": years.tolist(),
+        "month": months.tolist(),
+        "day": day_numbers.tolist(),
+    }
+    columns.update(by_game)
+    return fields, [columns.get(f) or [""] * len(days) for f in fields]
+
+def admin_columns(days, values, games):
+    """(fieldnames, columns) in the dummy_gali1_2015_to_today.csv layout"""
+    return ["date"] + list(games), [np.datetime_as_string(days, unit="D").tolist()] + value_columns(values)
+
+def write_rows(history, layout, out_path, base_url=BASE_URL):
+    """Write a historical/admin layout as CSV, or as a JSON list of rows for a .json path"""
+    as_json = out_path.endswith(".json")
+    written = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for days, values in history.chunks():
+            if layout == "historical":
+                fields, columns = historical_columns(days, values, history.games, base_url)
+            else:
+                fields, columns = admin_columns(days, values, history.games)
+            if as_json:
+                f.write("[\n" if written == 0 else ",\n")
+                f.write(",\n".join(json.dumps(dict(zip(fields, row)), ensure_ascii=False) for row in zip(*columns)))
+            else:
+                if written == 0:
+                    writer.writerow(fields)
+                writer.writerows(zip(*columns))
+            written += len(days)
+        if as_json:
+            f.write("\n]\n" if written else "[]\n")
+    return written
+
+def write_monthly(history, out_path):
+    """monthly_results.json layout, newest month first; a missing value leaves its key out"""
+    dates, years, months, _ = date_parts(history.days)
+    columns = value_columns(history.values)
+    fields = [g.capitalize() for g in history.games]
+    keys = years * 100 + months
+    # Row ranges per month, newest first
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    dates = dates.tolist()
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for n, (start, end) in enumerate(zip(starts[::-1].tolist(), ends[::-1].tolist())):
+            month = dates[start][:7]
+            rows = []
+            for i in range(start, end):
+                row = {"date": dates[i]}
+                row.update((g, c[i]) for g, c in zip(history.games, columns) if c[i])
+                rows.append(row)
+            f.write(("," if n else "") + "\n  " + json.dumps(month) + ": ")
+            f.write(json.dumps({"month": month, "fields": fields, "rows": rows}, ensure_ascii=False))
+        f.write("\n}\n")
+    return len(dates)
+
+def parse_games(spec, layout):
+    """Comma-separated game names, or a count: the layout's games padded with game5, game6, ..."""
+    if spec is None:
+        return list(LAYOUTS[layout])
+    if spec.isdigit():
+        base = list(LAYOUTS[layout])[:int(spec)]
+        return base + [f"game{i}" for i in range(len(base) + 1, int(spec) + 1)]
+    return [g.strip() for g in spec.split(",") if g.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic result history")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="historical")
+    parser.add_argument("--start-year", type=int, default=2015)
+    parser.add_argument("--end-year", type=int, default=2025)
+    parser.add_argument("--games", default=None, help="comma-separated names, or a count (default: the layout's games)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--missing-rate", type=float, default=0.01, help="share of values left empty")
+    parser.add_argument("--base-url", default=BASE_URL, help="chart URL base for source_url (historical)")
+    parser.add_argument("--out", default=None, help="output path (default: synthetic_<layout>.csv/.json)")
+    args = parser.parse_args()
+
+    if not 1 <= args.start_year <= args.end_year <= 9999:
+        parser.error("years must satisfy 1 <= --start-year <= --end-year <= 9999")
+    out = args.out or f"synthetic_{args.layout}.{'json' if args.layout == 'monthly' else 'csv'}"
+    games = parse_games(args.games, args.layout)
+
+    started = time.perf_counter()
+    history = SyntheticHistory(range(args.start_year, args.end_year + 1), games, args.seed, args.missing_rate)
+    print(f"🎲 {len(history):,} days x {len(games)} games (seed {args.seed}) in {time.perf_counter() - started:.2f}s")
+    if args.layout == "monthly":
+        rows = write_monthly(history, out)
+    else:
+        rows = write_rows(history, args.layout, out, args.base_url)
+    print(f"✅ Wrote {rows:,} rows ({rows * len(games):,} values) to {out} in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    main()
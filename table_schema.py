@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Shared monthly-table detection for the BeautifulSoup parsers
+A TableSchema finds the tables whose header row names the wanted columns and
+maps each column to its cell index. Tables whose header text cannot satisfy
+the schema are dropped after one get_text() of the header row. The resolved
+mapping is cached per header fingerprint, so once a site's template has been
+seen, every later page with the same header skips the per-cell scan.
+"""
+
+# (field, header substrings) in precedence order: a header cell maps to the
+# first field with a matching substring
+COLUMN_ALIASES = (
+    ("date", ("date",)),
+    ("dswr", ("dswr", "desaw", "disaw")),
+    ("frbd", ("frbd", "farid")),
+    ("gzbd", ("gzbd", "gzb", "ghazi")),
+    ("gali", ("gali",)),
+)
+GAME_FIELDS = ("dswr", "frbd", "gzbd", "gali")
+
+# Distinct templates are few; this only bounds pathological inputs
+MAX_CACHED_HEADERS = 1024
+
+class TableMatch:
+    __slots__ = ("table", "columns", "header_text")
+
+    def __init__(self, table, columns, header_text):
+        self.table = table
+        self.columns = columns          # field -> cell index
+        self.header_text = header_text  # lower-cased header row text
+
+def header_row(table):
+    """The <thead>, else the first <tr>, else None"""
+    return table.find("thead") or table.find("tr")
+
+def resolve_columns(headers):
+    """field -> index for lower-cased header cell texts (a later duplicate wins)"""
+    columns = {}
+    for idx, header in enumerate(headers):
+        for field, aliases in COLUMN_ALIASES:
+            if any(alias in header for alias in aliases):
+                columns[field] = idx
+                break
+    return columns
+
+class TableSchema:
+    """
+    A table matches when its header names every `required` field and at
+    least `min_games` of the game columns.
+    """
+
+    def __init__(self, required=("date", "gali"), min_games=1):
+        self.required = tuple(required)
+        self.min_games = min_games
+        aliases = dict(COLUMN_ALIASES)
+        self._required_aliases = [aliases[field] for field in self.required]
+        self._game_aliases = [aliases[field] for field in GAME_FIELDS]
+        self._cache = {}  # (header cells, header text) -> columns, or None for a non-match
+        self.hits = 0
+        self.misses = 0
+
+    def _could_match(self, text):
+        if not all(any(a in text for a in aliases) for aliases in self._required_aliases):
+            return False
+        return sum(any(a in text for a in aliases) for aliases in self._game_aliases) >= self.min_games
+
+    def _accepts(self, columns):
+        return all(f in columns for f in self.required) and sum(f in columns for f in GAME_FIELDS) >= self.min_games
+
+    def columns(self, table):
+        """(columns, header text) for a matching table, else None"""
+        header = header_row(table)
+        if header is None:
+            return None
+        text = header.get_text(" ").lower()
+        if not self._could_match(text):
+            return None
+        cells = header.find_all(["th", "td"])
+        key = (len(cells), text)
+        if key in self._cache:
+            self.hits += 1
+            columns = self._cache[key]
+        else:
+            self.misses += 1
+            columns = resolve_columns([c.get_text(separator=" ").strip().lower() for c in cells])
+            if not self._accepts(columns):
+                columns = None
+            if len(self._cache) >= MAX_CACHED_HEADERS:
+                self._cache.clear()
+            self._cache[key] = columns
+        return (columns, text) if columns is not None else None
+
+    def tables(self, soup):
+        """A TableMatch for every matching table, in page order"""
+        for table in soup.find_all("table"):
+            found = self.columns(table)
+            if found is not None:
+                yield TableMatch(table, *found)
+
+    def first(self, soup):
+        return next(self.tables(soup), None)
+
+# satta-king-fast.com charts: DATE | DSWR | FRBD | GZBD | GALI
+CHART_TABLE = TableSchema(required=("date", "gali"))
+# newghaziabad.com: day column first, then game names (FARIDABAD, GHAZIABAD, ...)
+NAMED_GAMES_TABLE = TableSchema(required=(), min_games=2)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Chart-page URL planning for the crawlers
+Every monthly chart on satta-king-fast.com lives at
+chart.php?ResultFor=<Month>-<Year>&month=MM&year=YYYY, so a crawl can be
+seeded with exactly one URL per month instead of discovering them by BFS.
+Links found while crawling go through `is_chart_url`, so only chart pages for
+the requested years are ever enqueued.
+"""
+
+import re
+from urllib.parse import parse_qs, urljoin, urlparse
+
+CHART_PATH = "chart.php"
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+RESULT_FOR_RE = re.compile(r"^([A-Za-z]+)-(\d{4})$")
+
+def chart_url(base_url, year, month):
+    return urljoin(base_url, f"{CHART_PATH}?ResultFor={MONTH_NAMES[month - 1]}-{year}&month={month:02d}&year={year}")
+
+def plan_chart_urls(base_url, years):
+    """(url, year, month) for every month of `years`, oldest first"""
+    return [(chart_url(base_url, year, month), year, month) for year in years for month in range(1, 13)]
+
+def chart_month(url):
+    """(year, month) a chart URL points at, or None if it is not a chart URL"""
+    parts = urlparse(url)
+    if not parts.path.endswith("/" + CHART_PATH) and parts.path != CHART_PATH:
+        return None
+    query = parse_qs(parts.query)
+    year = query.get("year", [""])[0]
+    month = query.get("month", [""])[0]
+    if year.isdigit() and month.isdigit():
+        return int(year), int(month)
+    # Older links only carry ResultFor=January-2015
+    match = RESULT_FOR_RE.match(query.get("ResultFor", [""])[0])
+    if match and match.group(1).capitalize() in MONTH_NAMES:
+        return int(match.group(2)), MONTH_NAMES.index(match.group(1).capitalize()) + 1
+    return None
+
+def is_chart_url(url, base_url, years):
+    """True for chart pages on the same host whose month falls in `years`"""
+    host, base = urlparse(url).netloc, urlparse(base_url).netloc
+    if host != base and not host.endswith("." + base):
+        return False
+    found = chart_month(url)
+    return found is not None and found[0] in years and 1 <= found[1] <= 12
@@ -4,13 +4,17 @@ Working scraper based on the actual HTML structure from satta-king-fast.com
 """
 
 import requests
-from bs4 import BeautifulSoup
-import time
-import csv
 import re
 import json
 from datetime import datetime
 
+from http_cache import CachedSession
+from page_archive import PageArchive
+from adaptive_limiter import AdaptiveLimiter
+from csv_sink import MonthlyCsvSink
+from chart_parser import parse_chart_rows
+from result_row import ResultRow
+
 BASE_URL = "https://satta-king-fast.com/"
 USER_AGENT = "Mozilla/5.0 (compatible; WorkingScraper/1.0)"
 
@@ -19,18 +23,19 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
+session = CachedSession(requests.Session(), limiter=AdaptiveLimiter.from_delay(2.0), archive=PageArchive())
+session.headers.update(HEADERS)
+
 def scrape_monthly_data(url):
     """Scrape monthly data from a specific URL"""
     print(f"Scraping: {url}")
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = session.get(url, timeout=15)
         if response.status_code != 200:
             print(f"Failed: {response.status_code}")
             return []
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         # Extract year and month from URL
         year_match = re.search(r'year=(\d{4})', url)
         month_match = re.search(r'month=(\d{2})', url)
@@ -39,26 +44,22 @@ def scrape_monthly_data(url):
         
         print(f"  Year: {year}, Month: {month}")
         
-        # Find the monthly chart table
-        chart_table = soup.find('table', class_='chart-table')
-        if not chart_table:
+        # Cell texts of the day-number rows in the monthly chart table
+        day_rows = parse_chart_rows(response.content)
+        if day_rows is None:
             print("  No chart table found")
             return []
         
-        # Find all day-number rows
-        day_rows = chart_table.find_all('tr', class_='day-number')
         print(f"  Found {len(day_rows)} day rows")
         
         monthly_data = []
         
-        for row in day_rows:
-            cells = row.find_all(['td', 'th'])
+        for cells in day_rows:
             if len(cells) < 5:  # Need at least 5 columns (DATE, DSWR, FRBD, GZBD, GALI)
                 continue
             
             # Get day number from first cell
-            day_text = cells[0].get_text(strip=True)
-            day_match = re.search(r'(\d{1,2})', day_text)
+            day_match = re.search(r'(\d{1,2})', cells[0])
             if not day_match:
                 continue
             
@@ -73,21 +74,11 @@ def scrape_monthly_data(url):
                 date_str = f"0000-00-{day:02d}"
             
             # Get values from cells 1-4 (DSWR, FRBD, GZBD, GALI)
-            def get_value(cell):
-                val = cell.get_text(strip=True)
+            def get_value(val):
                 return "" if val in ["XX", "--", ""] else val
             
-            entry = {
-                "date": date_str,
-                "dswr": get_value(cells[1]),
-                "frbd": get_value(cells[2]),
-                "gzbd": get_value(cells[3]),
-                "gali": get_value(cells[4]),
-                "source_url": url,
-                "year": year,
-                "month": month,
-                "day": day
-            }
+            entry = ResultRow(year, month, day, get_value(cells[1]), get_value(cells[2]),
+                              get_value(cells[3]), get_value(cells[4]), url, date_str)
             
             monthly_data.append(entry)
             
@@ -101,8 +92,8 @@ def scrape_monthly_data(url):
         print(f"  Error: {e}")
         return []
 
-def test_multiple_months():
-    """Test scraping multiple months"""
+def test_multiple_months(sink):
+    """Test scraping multiple months, streaming each one into `sink`"""
     
     # Test URLs for different months
     test_urls = [
@@ -113,52 +104,36 @@ def test_multiple_months():
         "https://satta-king-fast.com/chart.php?ResultFor=June-2025&month=06&year=2025",
     ]
     
-    all_data = []
-    
     for url in test_urls:
-        data = scrape_monthly_data(url)
-        all_data.extend(data)
-        time.sleep(2)  # Be respectful
-    
-    return all_data
+        # Pacing is done by the session's adaptive limiter
+        sink.write_month(scrape_monthly_data(url))
 
-def save_data(data, filename):
-    """Save data to CSV"""
-    if not data:
+def save_data(sink):
+    """Merge the streamed months into the CSV"""
+    sink.close()
+    if not sink.total_rows:
         print("No data to save")
         return
     
-    fieldnames = ["date", "dswr", "frbd", "gzbd", "gali", "source_url", "year", "month", "day"]
-    
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Sort by date
-        for row in sorted(data, key=lambda x: (x["year"] or 0, x["month"] or 0, x["day"] or 0)):
-            writer.writerow(row)
-    
-    print(f"\n✅ Data saved: {len(data)} rows -> {filename}")
+    print(f"\n✅ Data saved: {sink.total_rows} rows -> {sink.filename}")
     
     # Show summary
-    years = sorted(set(r["year"] for r in data if r["year"]))
-    months = sorted(set((r["year"], r["month"]) for r in data if r["year"] and r["month"]))
+    years = sink.years()
+    months = sink.months()
     
     print(f"📊 Years covered: {years}")
     print(f"📅 Months covered: {len(months)}")
     for year, month in months:
-        count = len([r for r in data if r["year"] == year and r["month"] == month])
-        print(f"  {year}-{month:02d}: {count} days")
+        print(f"  {year}-{month:02d}: {sink.month_days[(year, month)]} days")
         
         # Show sample data for this month
-        month_data = [r for r in data if r["year"] == year and r["month"] == month]
-        if month_data:
-            sample = month_data[0]
-            print(f"    Sample: {sample['date']} -> DSWR={sample['dswr']}, FRBD={sample['frbd']}, GZBD={sample['gzbd']}, GALI={sample['gali']}")
+        sample = sink.month_samples[(year, month)]
+        print(f"    Sample: {sample['date']} -> DSWR={sample['dswr']}, FRBD={sample['frbd']}, GZBD={sample['gzbd']}, GALI={sample['gali']}")
 
 if __name__ == "__main__":
     print("Testing working historical data scraper...")
     print("=" * 50)
     
-    data = test_multiple_months()
-    save_data(data, "working_historical_data.csv")
+    sink = MonthlyCsvSink("working_historical_data.csv")
+    test_multiple_months(sink)
+    save_data(sink)